@@ -2,13 +2,19 @@
 Database configuration and session management
 """
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session
-from sqlalchemy.ext.declarative import declarative_base
-from contextlib import contextmanager
+import logging
+from sqlalchemy import create_engine, func, literal, DateTime, Interval
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from contextlib import contextmanager, asynccontextmanager
 
-# Create base for all models
-Base = declarative_base()
+logger = logging.getLogger(__name__)
+
+
+class Base(DeclarativeBase):
+    """
+    Declarative base for all models
+    """
 
 # Database URL from environment
 DATABASE_URL = os.getenv('DATABASE_URL')
@@ -16,22 +22,92 @@ DATABASE_URL = os.getenv('DATABASE_URL')
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is required")
 
-# Create engine with connection pooling
+
+def _async_database_url(url: str) -> str:
+    """
+    Convert a sync database URL to its async driver equivalent
+    """
+    for prefix in ('postgresql+psycopg2://', 'postgresql://', 'postgres://'):
+        if url.startswith(prefix):
+            return 'postgresql+asyncpg://' + url[len(prefix):]
+    if url.startswith('sqlite://'):
+        return 'sqlite+aiosqlite://' + url[len('sqlite://'):]
+    return url
+
+
+# Pool settings, tunable per deployment through the environment
+POOL_OPTIONS = {
+    'pool_size': int(os.getenv('DB_POOL_SIZE', '20')),
+    'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '40')),
+    'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', '5')),
+    'pool_use_lifo': True,  # Reuse the hottest connection, let idle ones get recycled
+    # Verify connections before using; set DB_POOL_PRE_PING=0 to save the round trip
+    'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', '1') != '0',
+    'pool_recycle': 3600,   # Recycle connections after 1 hour
+}
+
+# Compiled-statement LRU per engine (SQLAlchemy default is 500)
+QUERY_CACHE_SIZE = 2000
+
+# Create engine with connection pooling (used by scripts and init_db)
 engine = create_engine(
     DATABASE_URL,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,  # Verify connections before using
-    pool_recycle=3600,   # Recycle connections after 1 hour
+    **POOL_OPTIONS,
+    query_cache_size=QUERY_CACHE_SIZE,
     echo=False  # Set to True for SQL debugging
 )
 
-# Create session factory
-SessionLocal = scoped_session(sessionmaker(
-    autocommit=False,
+# Async engine for handlers running inside the event loop
+async_engine = create_async_engine(
+    _async_database_url(DATABASE_URL),
+    **POOL_OPTIONS,
+    query_cache_size=QUERY_CACHE_SIZE,
+    echo=False
+)
+
+# Both factories: no autoflush (writers flush at commit, or call flush()
+# themselves when they need a generated PK early) and no expiry on commit
+# (objects stay readable after commit without re-SELECTing every attribute)
+
+# Create session factory - every call returns a fresh session
+# (a thread-local scoped_session would be shared by coroutines on the same thread)
+SessionLocal = sessionmaker(
     autoflush=False,
+    expire_on_commit=False,
     bind=engine
-))
+)
+
+# Async session factory - one session per unit of work, never shared across event loops
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
+def upsert_insert(table):
+    """
+    Dialect-specific INSERT that supports on_conflict_do_update()
+    """
+    if async_engine.dialect.name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert(table)
+
+
+def add_seconds(timestamp, seconds):
+    """
+    Dialect-specific SQL expression for timestamp + seconds
+    
+    Args:
+        timestamp: DateTime column or expression (wrap plain values in literal())
+        seconds: Integer column, expression or value
+    """
+    if async_engine.dialect.name == 'sqlite':
+        return func.datetime(timestamp, literal('+').concat(seconds).concat(' seconds'), type_=DateTime)
+    return timestamp + func.make_interval(0, 0, 0, 0, 0, 0, seconds, type_=Interval)
 
 
 def get_db_session():
@@ -61,6 +137,20 @@ def db_session():
         session.close()
 
 
+@asynccontextmanager
+async def async_db_session():
+    """
+    Async context manager for database sessions
+    """
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
 def get_db():
     """
     Dependency injection function for FastAPI or similar
@@ -72,18 +162,28 @@ def get_db():
         db.close()
 
 
-def init_db():
+def init_db(bind=None):
     """
     Initialize database tables
+    
+    Args:
+        bind: Connection to create them on (e.g. inside a migration's
+            transaction); defaults to the engine
     """
     # Import all models to register them with Base
     from app.models.contract_address import ContractAddress
     from app.models.pair_contract import PairContract
     from app.models.failed_lookup import FailedContractLookup
     from app.models.api_call_log import ApiCallLog
-    
-    Base.metadata.create_all(bind=engine)
-    print("✅ Database tables initialized")
+    from app.models.api_call_log_hourly import ApiCallLogHourly
+
+    bind = bind or engine
+    tables = None
+    if bind.dialect.name == 'postgresql':
+        # Created partitioned by app.utils.log_partitions.maintain_partitions
+        tables = [table for table in Base.metadata.sorted_tables if table is not ApiCallLog.__table__]
+    Base.metadata.create_all(bind=bind, tables=tables)
+    logger.info("Database tables initialized")
 
 
 def close_db():
@@ -92,3 +192,12 @@ def close_db():
     """
     engine.dispose()
 
+
+async def close_async_db():
+    """
+    Close async database connections (call before the event loop shuts down)
+    """
+    from app.utils.api_call_logger import flush_api_call_logs
+
+    await flush_api_call_logs()
+    await async_engine.dispose()
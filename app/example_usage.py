@@ -4,8 +4,9 @@ Example usage of ContractResolver service
 import asyncio
 import os
 from dotenv import load_dotenv
-from app.database import db_session
+from app.database import async_db_session, close_async_db
 from app.services.contract_resolver import ContractResolver
+from app.services.api_clients.http import close_session
 
 # Load environment variables
 load_dotenv()
@@ -13,7 +14,7 @@ load_dotenv()
 
 async def example_get_contract():
     """Example: Get contract address for a token"""
-    with db_session() as session:
+    async with async_db_session() as session:
         resolver = ContractResolver(session)
         
         # Get USDT contract on Ethereum
@@ -30,7 +31,7 @@ async def example_get_contract():
 
 async def example_get_pair():
     """Example: Get contracts for a trading pair"""
-    with db_session() as session:
+    async with async_db_session() as session:
         resolver = ContractResolver(session)
         
         # Get contracts for USDT/ETH pair
@@ -46,7 +47,7 @@ async def example_get_pair():
 
 async def example_get_stats():
     """Example: Get API statistics"""
-    with db_session() as session:
+    async with async_db_session() as session:
         resolver = ContractResolver(session)
         
         # Get stats for last 24 hours
@@ -76,6 +77,9 @@ async def main():
     print()
     
     print("✅ Examples completed!")
+    
+    await close_session()
+    await close_async_db()
 
 
 if __name__ == '__main__':
@@ -3,14 +3,67 @@ Telegram bot handler for contract address commands
 """
 import asyncio
 import logging
+import re
+import string
 from typing import Optional
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from cachetools import TTLCache
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.contract_resolver import ContractResolver
+from app.utils.contract_cache import ContractCache
 
 logger = logging.getLogger(__name__)
 
+# Formatted replies, keyed by request arguments and ContractCache.version so
+# any write to contract_addresses invalidates them. Only successful replies
+# are stored; get/set happen without an await in between, so no lock is needed.
+_contracts_reply_cache = TTLCache(maxsize=2048, ttl=300)
+# Stats lag naturally, a short TTL is enough
+_api_stats_reply_cache = TTLCache(maxsize=64, ttl=60)
+
+# BASE/QUOTE, compiled once; the resolver uppercases symbols itself
+_PAIR_RE = re.compile(r'([A-Z0-9]{1,20})/([A-Z0-9]{1,20})', re.IGNORECASE)
+
+# Canonical display names for supported blockchains
+_BLOCKCHAIN_DISPLAY = {
+    'ethereum': 'Ethereum',
+    'bsc': 'BNB Chain',
+    'polygon': 'Polygon',
+    'arbitrum': 'Arbitrum',
+    'optimism': 'Optimism',
+    'avalanche': 'Avalanche',
+    'fantom': 'Fantom',
+    'base': 'Base',
+    'zksync': 'zkSync',
+    'scroll': 'Scroll'
+}
+
+
+_FORMATTER = string.Formatter()
+
+
+def _compile_messages(messages: dict) -> dict:
+    """
+    Pre-parse str.format templates into (literal, field, spec, conversion) tuples
+    """
+    return {key: list(_FORMATTER.parse(template)) for key, template in messages.items()}
+
+
+def _render(template: list, **kwargs) -> str:
+    """
+    Render a template compiled by _compile_messages
+    """
+    parts = []
+    for literal, name, spec, conversion in template:
+        parts.append(literal)
+        if name is not None:
+            value = kwargs[name]
+            if conversion:
+                value = _FORMATTER.convert_field(value, conversion)
+            parts.append(format(value, spec or ''))
+    return ''.join(parts)
+
 
 class ContractsHandler:
     """
@@ -67,15 +120,23 @@ class ContractsHandler:
         'error_generic': '❌ An error occurred. Please try again later.'
     }
     
-    def __init__(self, db_session: Session, language: str = 'ru'):
+    # Templates parsed once at import instead of on every .format() call
+    _COMPILED_RU = _compile_messages(MESSAGES_RU)
+    _COMPILED_EN = _compile_messages(MESSAGES_EN)
+    
+    def __init__(self, db_session: AsyncSession, language: str = 'ru'):
         self.resolver = ContractResolver(db_session)
         self.language = language
         self.messages = self.MESSAGES_RU if language == 'ru' else self.MESSAGES_EN
+        self.templates = self._COMPILED_RU if language == 'ru' else self._COMPILED_EN
     
     def set_language(self, language: str):
         """Set handler language"""
+        if language == self.language:
+            return
         self.language = language
         self.messages = self.MESSAGES_RU if language == 'ru' else self.MESSAGES_EN
+        self.templates = self._COMPILED_RU if language == 'ru' else self._COMPILED_EN
     
     async def handle_contracts_command(
         self,
@@ -92,80 +153,89 @@ class ContractsHandler:
         Returns:
             Formatted message string
         """
+        m = self.messages
+        t = self.templates
+        cached_reply = _contracts_reply_cache.get((pair, blockchain, self.language, ContractCache.version))
+        if cached_reply is not None:
+            return cached_reply
+        
         try:
             # Get pair contracts
             pair_data = await self.resolver.get_pair_contracts(pair, blockchain)
             
             # Format message
             lines = [
-                self.messages['contracts_title'].format(
+                _render(t['contracts_title'],
                     pair=pair,
-                    blockchain=blockchain.capitalize()
+                    blockchain=_BLOCKCHAIN_DISPLAY.get(blockchain.lower(), blockchain.capitalize())
                 ),
                 ''
             ]
             
             # Base token
             base = pair_data['base_token']
-            lines.append(self.messages['token_info'].format(
+            lines.append(_render(t['token_info'],
                 name=base.get('name', base['symbol']),
                 symbol=base['symbol']
             ))
             
             if base.get('contract'):
-                lines.append(self.messages['contract_address'].format(
+                lines.append(_render(t['contract_address'],
                     address=base['contract']
                 ))
                 if base.get('decimals'):
-                    lines.append(self.messages['decimals'].format(
+                    lines.append(_render(t['decimals'],
                         decimals=base['decimals']
                     ))
             else:
-                lines.append(self.messages['native_token'])
+                lines.append(m['native_token'])
             
             lines.append('')
             
             # Quote token
             quote = pair_data['quote_token']
-            lines.append(self.messages['token_info'].format(
+            lines.append(_render(t['token_info'],
                 name=quote.get('name', quote['symbol']),
                 symbol=quote['symbol']
             ))
             
             if quote.get('contract'):
-                lines.append(self.messages['contract_address'].format(
+                lines.append(_render(t['contract_address'],
                     address=quote['contract']
                 ))
                 if quote.get('decimals'):
-                    lines.append(self.messages['decimals'].format(
+                    lines.append(_render(t['decimals'],
                         decimals=quote['decimals']
                     ))
             else:
-                lines.append(self.messages['native_token'])
+                lines.append(m['native_token'])
             
             lines.append('')
             
             # Cache status
             if base.get('source') == 'cache' or quote.get('source') == 'cache':
-                lines.append(self.messages['cached'])
+                lines.append(m['cached'])
                 # Try to get last verified time from cache
                 # This would require querying the database, simplified for now
-                lines.append(self.messages['last_verified'].format(
+                lines.append(_render(t['last_verified'],
                     time='недавно' if self.language == 'ru' else 'recently'
                 ))
             
-            return '\n'.join(lines)
+            reply = '\n'.join(lines)
+            _contracts_reply_cache[(pair, blockchain, self.language, ContractCache.version)] = reply
+            return reply
             
         except ValueError as e:
             if 'Invalid pair format' in str(e):
-                return self.messages['error_invalid_pair']
-            return self.messages['error_not_found'].format(
-                symbol=pair.split('/')[0] if '/' in pair else pair,
+                return m['error_invalid_pair']
+            pair_match = _PAIR_RE.fullmatch(pair)
+            return _render(t['error_not_found'],
+                symbol=pair_match.group(1) if pair_match else pair,
                 blockchain=blockchain
             )
         except Exception as e:
-            logger.error(f"Error handling contracts command: {e}")
-            return self.messages['error_generic']
+            logger.error("Error handling contracts command: %s", e)
+            return m['error_generic']
     
     async def handle_api_stats_command(self, hours: int = 24) -> str:
         """
@@ -177,50 +247,58 @@ class ContractsHandler:
         Returns:
             Formatted message string
         """
+        m = self.messages
+        t = self.templates
+        cached_reply = _api_stats_reply_cache.get((hours, self.language))
+        if cached_reply is not None:
+            return cached_reply
+        
         try:
             stats = await self.resolver.get_api_stats(hours)
             
             lines = [
-                self.messages['api_stats_title'].format(hours=hours),
+                _render(t['api_stats_title'], hours=hours),
                 '',
-                self.messages['total_calls'].format(count=stats['total_calls']),
-                self.messages['successful_calls'].format(count=stats['successful_calls']),
-                self.messages['failed_calls'].format(count=stats['failed_calls']),
+                _render(t['total_calls'], count=stats['total_calls']),
+                _render(t['successful_calls'], count=stats['successful_calls']),
+                _render(t['failed_calls'], count=stats['failed_calls']),
                 '',
-                self.messages['cache_hit_rate'].format(rate=stats['cache_hit_rate']),
-                self.messages['cache_hits'].format(count=stats.get('cache_hits', 0)),
-                self.messages['cache_misses'].format(count=stats.get('cache_misses', 0)),
-                self.messages['api_calls_saved'].format(count=stats.get('api_calls_saved', 0)),
+                _render(t['cache_hit_rate'], rate=stats['cache_hit_rate']),
+                _render(t['cache_hits'], count=stats.get('cache_hits', 0)),
+                _render(t['cache_misses'], count=stats.get('cache_misses', 0)),
+                _render(t['api_calls_saved'], count=stats.get('api_calls_saved', 0)),
                 ''
             ]
             
             if stats['avg_response_time_ms'] > 0:
-                lines.append(self.messages['avg_response_time'].format(
+                lines.append(_render(t['avg_response_time'],
                     time=stats['avg_response_time_ms']
                 ))
                 lines.append('')
             
             # By API breakdown
             if stats['by_api']:
-                lines.append(self.messages['by_api'])
+                lines.append(m['by_api'])
                 for api_name, api_stats in stats['by_api'].items():
-                    lines.append(self.messages['api_stats'].format(
+                    lines.append(_render(t['api_stats'],
                         api=api_name.upper(),
                         success=api_stats['success'],
                         total=api_stats['total'],
                         avg_time=api_stats.get('avg_response_time_ms', 0)
                     ))
             
-            return '\n'.join(lines)
+            reply = '\n'.join(lines)
+            _api_stats_reply_cache[(hours, self.language)] = reply
+            return reply
             
         except Exception as e:
-            logger.error(f"Error handling api_stats command: {e}")
-            return self.messages['error_generic']
+            logger.error("Error handling api_stats command: %s", e)
+            return m['error_generic']
 
 
 # Integration function for TypeScript bot
 async def handle_contracts_command_async(
-    db_session: Session,
+    db_session: AsyncSession,
     pair: str,
     blockchain: str = 'ethereum',
     language: str = 'ru'
@@ -234,7 +312,7 @@ async def handle_contracts_command_async(
 
 
 async def handle_api_stats_command_async(
-    db_session: Session,
+    db_session: AsyncSession,
     hours: int = 24,
     language: str = 'ru'
 ) -> str:
@@ -3,17 +3,17 @@ Integration bridge for calling Python contract resolver from TypeScript/Node.js
 This can be used via subprocess or HTTP API
 """
 import asyncio
-import json
 import sys
 import os
 from typing import Dict, Any, Optional
-from sqlalchemy.orm import Session
 
-from app.database import db_session
-from app.handlers.contracts_handler import (
-    handle_contracts_command_async,
-    handle_api_stats_command_async
-)
+import orjson
+
+# Allow running as a script (python app/integration_bridge.py) from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app.database / app.handlers (SQLAlchemy, drivers, models) are imported
+# inside the functions below so malformed CLI calls exit without loading them
 
 
 async def handle_contracts_request(
@@ -33,7 +33,10 @@ async def handle_contracts_request(
         Dictionary with response
     """
     try:
-        with db_session() as session:
+        from app.database import async_db_session
+        from app.handlers.contracts_handler import handle_contracts_command_async
+        
+        async with async_db_session() as session:
             message = await handle_contracts_command_async(
                 session,
                 pair,
@@ -66,7 +69,10 @@ async def handle_api_stats_request(
         Dictionary with response
     """
     try:
-        with db_session() as session:
+        from app.database import async_db_session
+        from app.handlers.contracts_handler import handle_api_stats_command_async
+        
+        async with async_db_session() as session:
             message = await handle_api_stats_command_async(
                 session,
                 hours,
@@ -83,47 +89,130 @@ async def handle_api_stats_request(
         }
 
 
+async def _run_and_close(coro):
+    """
+    Run a request coroutine, then close the HTTP session and dispose the
+    async engine before the loop closes
+    """
+    try:
+        return await coro
+    finally:
+        from app.database import close_async_db
+        from app.services.api_clients.http import close_session
+        
+        await close_session()
+        await close_async_db()
+
+
+def _write_json(payload: Dict[str, Any]):
+    """
+    Write a JSON line to stdout (orjson emits UTF-8 bytes directly)
+    """
+    sys.stdout.buffer.write(orjson.dumps(payload, option=orjson.OPT_NAIVE_UTC))
+    sys.stdout.buffer.write(b'\n')
+    sys.stdout.buffer.flush()
+
+
+DEFAULT_SOCKET_PATH = os.getenv('CONTRACTS_BRIDGE_SOCKET', '/tmp/contracts.sock')
+
+
+def create_app():
+    """
+    Build the persistent HTTP app served over a Unix socket
+    
+    Keeps the interpreter, imports and the async connection pool warm
+    across requests instead of paying for them on every CLI call.
+    """
+    from contextlib import asynccontextmanager, suppress
+    from fastapi import FastAPI
+    from fastapi.responses import ORJSONResponse
+    
+    @asynccontextmanager
+    async def lifespan(app):
+        from app.database import close_async_db
+        from app.services.api_clients.http import close_session
+        from app.utils.log_partitions import run_partition_maintenance
+        
+        maintenance = asyncio.create_task(run_partition_maintenance())
+        yield
+        maintenance.cancel()
+        # Let it unwind (and release its connection) before the engine is disposed
+        with suppress(asyncio.CancelledError):
+            await maintenance
+        await close_session()
+        await close_async_db()
+    
+    app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+    
+    @app.get('/contracts')
+    async def contracts(pair: str, blockchain: str = 'ethereum', language: str = 'ru'):
+        return await handle_contracts_request(pair, blockchain, language)
+    
+    @app.get('/api_stats')
+    async def api_stats(hours: int = 24, language: str = 'ru'):
+        return await handle_api_stats_request(hours, language)
+    
+    return app
+
+
+def serve(socket_path: str = DEFAULT_SOCKET_PATH):
+    """
+    Run the bridge as a persistent server on a Unix domain socket
+    """
+    import uvicorn
+    
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)  # Stale socket from a previous run
+    
+    # loop='auto' picks uvloop when it is installed
+    uvicorn.run(create_app(), uds=socket_path, loop='auto', log_level='warning')
+
+
 def main():
     """
     CLI interface for calling from Node.js/TypeScript
     Usage: python app/integration_bridge.py contracts USDT/ETH ethereum ru
+           python app/integration_bridge.py serve [socket_path]
     """
     if len(sys.argv) < 2:
-        print(json.dumps({
+        _write_json({
             'success': False,
             'error': 'Invalid arguments'
-        }))
+        })
         sys.exit(1)
     
     command = sys.argv[1]
     
     if command == 'contracts':
         if len(sys.argv) < 3:
-            print(json.dumps({
+            _write_json({
                 'success': False,
                 'error': 'Missing pair argument'
-            }))
+            })
             sys.exit(1)
         
         pair = sys.argv[2]
         blockchain = sys.argv[3] if len(sys.argv) > 3 else 'ethereum'
         language = sys.argv[4] if len(sys.argv) > 4 else 'ru'
         
-        result = asyncio.run(handle_contracts_request(pair, blockchain, language))
-        print(json.dumps(result))
+        result = asyncio.run(_run_and_close(handle_contracts_request(pair, blockchain, language)))
+        _write_json(result)
         
     elif command == 'api_stats':
         hours = int(sys.argv[2]) if len(sys.argv) > 2 else 24
         language = sys.argv[3] if len(sys.argv) > 3 else 'ru'
         
-        result = asyncio.run(handle_api_stats_request(hours, language))
-        print(json.dumps(result))
+        result = asyncio.run(_run_and_close(handle_api_stats_request(hours, language)))
+        _write_json(result)
+        
+    elif command == 'serve':
+        serve(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_SOCKET_PATH)
         
     else:
-        print(json.dumps({
+        _write_json({
             'success': False,
             'error': f'Unknown command: {command}'
-        }))
+        })
         sys.exit(1)
 
 
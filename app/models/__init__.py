@@ -1,13 +1,19 @@
 # Models package initialization
-from .contract_address import ContractAddress
-from .pair_contract import PairContract
-from .failed_lookup import FailedContractLookup
-from .api_call_log import ApiCallLog
+from .contract_address import ContractAddress, ContractAddressDTO
+from .pair_contract import PairContract, PairContractDTO
+from .failed_lookup import FailedContractLookup, FailedContractLookupDTO
+from .api_call_log import ApiCallLog, ApiCallLogDTO
+from .api_call_log_hourly import ApiCallLogHourly, ApiCallLogHourlyDTO
 
 __all__ = [
     'ContractAddress',
     'PairContract',
     'FailedContractLookup',
-    'ApiCallLog'
+    'ApiCallLog',
+    'ApiCallLogHourly',
+    'ContractAddressDTO',
+    'PairContractDTO',
+    'FailedContractLookupDTO',
+    'ApiCallLogDTO',
+    'ApiCallLogHourlyDTO'
 ]
-
@@ -2,9 +2,24 @@
 SQLAlchemy model for api_call_logs table
 """
 from datetime import datetime
+from operator import attrgetter
+from typing import NamedTuple, Optional
 from sqlalchemy import Column, Integer, String, Boolean, Text, DateTime, Index
 from sqlalchemy.sql import func
 from app.database import Base
+from app.utils.serialization import isoformat_or_none
+
+
+class ApiCallLogDTO(NamedTuple):
+    """Read-only snapshot of an api_call_logs row (what to_dict() returns, as a tuple)"""
+    id: int
+    api_name: str
+    endpoint: Optional[str]
+    status_code: Optional[int]
+    success: Optional[bool]
+    response_time_ms: Optional[int]
+    called_at: datetime
+    error_message: Optional[str]
 
 
 class ApiCallLog(Base):
@@ -19,30 +34,32 @@ class ApiCallLog(Base):
     status_code = Column(Integer)
     success = Column(Boolean, default=False, index=True)
     response_time_ms = Column(Integer)
-    called_at = Column(DateTime, default=func.now(), nullable=False, index=True)
+    called_at = Column(DateTime, default=func.now(), nullable=False)
     error_message = Column(Text)
 
     # Indexes
     __table_args__ = (
         Index('idx_api_name', 'api_name'),
-        Index('idx_called_at', 'called_at'),
+        # Append-only time series: BRIN is tiny and cheap to maintain
+        Index('idx_called_at_brin', 'called_at', postgresql_using='brin'),
         Index('idx_api_success', 'success', 'called_at'),
+        # On PostgreSQL the table is created partitioned by day (keyed on
+        # (id, called_at)) by app.utils.log_partitions, not by create_all
         {'extend_existing': True}
     )
 
     def __repr__(self):
         return f"<ApiCallLog(api={self.api_name}, success={self.success}, time={self.response_time_ms}ms)>"
 
+    _DICT_KEYS = ApiCallLogDTO._fields
+    _dict_values = attrgetter(*_DICT_KEYS)
+
+    def to_dto(self) -> ApiCallLogDTO:
+        """Convert model to a lightweight tuple (datetimes left as-is)"""
+        return ApiCallLogDTO._make(self._dict_values(self))
+
     def to_dict(self) -> dict:
         """Convert model to dictionary"""
-        return {
-            'id': self.id,
-            'api_name': self.api_name,
-            'endpoint': self.endpoint,
-            'status_code': self.status_code,
-            'success': self.success,
-            'response_time_ms': self.response_time_ms,
-            'called_at': self.called_at.isoformat() if self.called_at else None,
-            'error_message': self.error_message
-        }
-
+        data = self.to_dto()._asdict()
+        data['called_at'] = isoformat_or_none(data['called_at'])
+        return data
@@ -0,0 +1,66 @@
+"""
+SQLAlchemy model for api_call_log_hourly table
+"""
+from datetime import datetime
+from operator import attrgetter
+from typing import NamedTuple
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Index, UniqueConstraint
+from app.database import Base
+from app.utils.serialization import isoformat_or_none
+
+
+class ApiCallLogHourlyDTO(NamedTuple):
+    """Read-only snapshot of an api_call_log_hourly row (what to_dict() returns, as a tuple)"""
+    id: int
+    api_name: str
+    hour_bucket: datetime
+    total: int
+    success: int
+    failure: int
+    sum_response_time_ms: int
+    response_count: int
+
+
+class ApiCallLogHourly(Base):
+    """
+    Per-API hourly rollup of api_call_logs, maintained on insert
+    so stats queries read one row per API per hour instead of every call
+    """
+    __tablename__ = 'api_call_log_hourly'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    api_name = Column(String(50), nullable=False)
+    hour_bucket = Column(DateTime, nullable=False)
+    total = Column(Integer, nullable=False, default=0)
+    success = Column(Integer, nullable=False, default=0)
+    failure = Column(Integer, nullable=False, default=0)
+    sum_response_time_ms = Column(BigInteger, nullable=False, default=0)
+    response_count = Column(Integer, nullable=False, default=0)  # calls that reported a response time
+
+    # Unique constraint on (api_name, hour_bucket) - target of the upsert
+    __table_args__ = (
+        UniqueConstraint('api_name', 'hour_bucket', name='uq_api_call_log_hourly'),
+        Index('idx_hourly_bucket', 'hour_bucket'),
+        {'extend_existing': True}
+    )
+
+    def __repr__(self):
+        return f"<ApiCallLogHourly(api={self.api_name}, hour={self.hour_bucket}, total={self.total})>"
+
+    _DICT_KEYS = ApiCallLogHourlyDTO._fields
+    _dict_values = attrgetter(*_DICT_KEYS)
+
+    def to_dto(self) -> ApiCallLogHourlyDTO:
+        """Convert model to a lightweight tuple (datetimes left as-is)"""
+        return ApiCallLogHourlyDTO._make(self._dict_values(self))
+
+    def to_dict(self) -> dict:
+        """Convert model to dictionary"""
+        data = self.to_dto()._asdict()
+        data['hour_bucket'] = isoformat_or_none(data['hour_bucket'])
+        return data
+
+    @staticmethod
+    def bucket_for(moment: datetime) -> datetime:
+        """Truncate a timestamp to its hour bucket"""
+        return moment.replace(minute=0, second=0, microsecond=0)
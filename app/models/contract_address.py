@@ -2,10 +2,30 @@
 SQLAlchemy model for contract_addresses table
 """
 from datetime import datetime
-from typing import Optional
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index
+from operator import attrgetter
+from typing import NamedTuple, Optional
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from app.database import Base
+from app.utils.serialization import isoformat_or_none
+
+# Bounds for the adaptive per-row cache TTL (see ContractCache._upsert)
+MIN_TTL_SECONDS = 300
+MAX_TTL_SECONDS = 7 * 86400
+
+
+class ContractAddressDTO(NamedTuple):
+    """Read-only snapshot of a contract_addresses row (what to_dict() returns, as a tuple)"""
+    id: int
+    symbol: str
+    name: Optional[str]
+    contract: str
+    blockchain: str
+    decimals: Optional[int]
+    verified: Optional[bool]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    last_verified_at: Optional[datetime]
 
 
 class ContractAddress(Base):
@@ -15,19 +35,34 @@ class ContractAddress(Base):
     __tablename__ = 'contract_addresses'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    token_symbol = Column(String(20), nullable=False, index=True)
+    token_symbol = Column(String(20), nullable=False)
     token_name = Column(String(100))
-    contract_address = Column(String(100), nullable=False, index=True)
+    contract_address = Column(String(100), nullable=False)
     blockchain = Column(String(50), nullable=False, index=True)
     decimals = Column(Integer)
     verified = Column(Boolean, default=False)
     created_at = Column(DateTime, default=func.now(), nullable=False)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
-    last_verified_at = Column(DateTime, index=True)
+    last_verified_at = Column(DateTime)
+    # Adaptive cache TTL: doubled when re-verification finds the same address,
+    # halved when the address changed; NULL means the cache's default TTL
+    suggested_ttl_seconds = Column(Integer)
+    last_ttl_updated_at = Column(DateTime)
+    # last_verified_at + suggested_ttl_seconds, set on write so reads filter on it
+    expires_at = Column(DateTime)
 
-    # Unique constraint on (token_symbol, blockchain, contract_address)
+    # Unique constraint on (token_symbol, blockchain, contract_address) - target of the upsert
     __table_args__ = (
-        Index('idx_token_blockchain', 'token_symbol', 'blockchain'),
+        UniqueConstraint(
+            'token_symbol', 'blockchain', 'contract_address',
+            name='contract_addresses_token_symbol_blockchain_contract_address_key'
+        ),
+        # Covering index: (symbol, blockchain) lookups range-scan the unexpired
+        # entries; INCLUDE holds every other column ContractCache selects
+        Index(
+            'idx_contract_lookup_cover', 'token_symbol', 'blockchain', 'expires_at',
+            postgresql_include=['token_name', 'contract_address', 'decimals', 'verified', 'last_verified_at']
+        ),
         Index('idx_contract_address', 'contract_address'),
         Index('idx_last_verified_at', 'last_verified_at'),
         {'extend_existing': True}
@@ -36,34 +71,60 @@ class ContractAddress(Base):
     def __repr__(self):
         return f"<ContractAddress(symbol={self.token_symbol}, blockchain={self.blockchain}, address={self.contract_address[:10]}...)>"
 
+    # Column behind each ContractAddressDTO field, in order (symbol is token_symbol, contract is contract_address)
+    _dict_values = attrgetter(
+        'id', 'token_symbol', 'token_name', 'contract_address', 'blockchain', 'decimals', 'verified',
+        'created_at', 'updated_at', 'last_verified_at'
+    )
+
+    def to_dto(self) -> ContractAddressDTO:
+        """Convert model to a lightweight tuple (datetimes left as-is)"""
+        return ContractAddressDTO._make(self._dict_values(self))
+
     def to_dict(self) -> dict:
         """Convert model to dictionary"""
-        return {
-            'id': self.id,
-            'symbol': self.token_symbol,
-            'name': self.token_name,
-            'contract': self.contract_address,
-            'blockchain': self.blockchain,
-            'decimals': self.decimals,
-            'verified': self.verified,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'last_verified_at': self.last_verified_at.isoformat() if self.last_verified_at else None
-        }
+        data = self.to_dto()._asdict()
+        data['created_at'] = isoformat_or_none(data['created_at'])
+        data['updated_at'] = isoformat_or_none(data['updated_at'])
+        data['last_verified_at'] = isoformat_or_none(data['last_verified_at'])
+        return data
 
-    def is_cache_valid(self, cache_ttl_seconds: int = 86400) -> bool:
+    def is_cache_valid(
+        self,
+        cache_ttl_seconds: Optional[int] = None,
+        now: Optional[datetime] = None
+    ) -> bool:
         """
         Check if cached data is still valid
         
         Args:
-            cache_ttl_seconds: Cache TTL in seconds (default 24 hours)
+            cache_ttl_seconds: Fixed TTL measured from last_verified_at; by
+                default the row's own adaptive expiry (expires_at) is used
+            now: Reference time; pass one value when checking many rows
             
         Returns:
             True if cache is valid, False otherwise
         """
-        if not self.last_verified_at:
+        now = now or datetime.utcnow()
+        if cache_ttl_seconds is not None:
+            if not self.last_verified_at:
+                return False
+            return (now - self.last_verified_at).total_seconds() < cache_ttl_seconds
+        
+        if not self.expires_at:
             return False
         
-        age_seconds = (datetime.utcnow() - self.last_verified_at).total_seconds()
-        return age_seconds < cache_ttl_seconds
+        return self.expires_at > now
 
+    @classmethod
+    def cache_valid_clause(cls, now: Optional[datetime] = None):
+        """
+        SQL filter matching rows for which is_cache_valid() would return True
+        
+        Args:
+            now: Reference time or bind parameter (default: current UTC time)
+            
+        Returns:
+            SQLAlchemy boolean clause for use in where()
+        """
+        return cls.expires_at > (datetime.utcnow() if now is None else now)
@@ -2,9 +2,22 @@
 SQLAlchemy model for failed_contract_lookups table
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from operator import attrgetter
+from typing import NamedTuple, Optional
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from app.database import Base
+from app.utils.serialization import isoformat_or_none
+
+
+class FailedContractLookupDTO(NamedTuple):
+    """Read-only snapshot of a failed_contract_lookups row (what to_dict() returns, as a tuple)"""
+    id: int
+    symbol: str
+    blockchain: str
+    error_message: Optional[str]
+    failed_at: Optional[datetime]
+    retry_count: Optional[int]
 
 
 class FailedContractLookup(Base):
@@ -14,14 +27,18 @@ class FailedContractLookup(Base):
     __tablename__ = 'failed_contract_lookups'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    token_symbol = Column(String(20), nullable=False, index=True)
-    blockchain = Column(String(50), nullable=False, index=True)
+    token_symbol = Column(String(20), nullable=False)
+    blockchain = Column(String(50), nullable=False)
     error_message = Column(Text)
     failed_at = Column(DateTime, default=func.now(), nullable=False)
     retry_count = Column(Integer, default=0)
 
-    # Unique constraint on (token_symbol, blockchain)
+    # Unique constraint on (token_symbol, blockchain) - target of the upsert
     __table_args__ = (
+        UniqueConstraint(
+            'token_symbol', 'blockchain',
+            name='failed_contract_lookups_token_symbol_blockchain_key'
+        ),
         Index('idx_failed_lookups', 'token_symbol', 'blockchain'),
         {'extend_existing': True}
     )
@@ -29,14 +46,15 @@ class FailedContractLookup(Base):
     def __repr__(self):
         return f"<FailedContractLookup(symbol={self.token_symbol}, blockchain={self.blockchain}, retries={self.retry_count})>"
 
+    # In FailedContractLookupDTO field order (symbol is token_symbol)
+    _dict_values = attrgetter('id', 'token_symbol', 'blockchain', 'error_message', 'failed_at', 'retry_count')
+
+    def to_dto(self) -> FailedContractLookupDTO:
+        """Convert model to a lightweight tuple (datetimes left as-is)"""
+        return FailedContractLookupDTO._make(self._dict_values(self))
+
     def to_dict(self) -> dict:
         """Convert model to dictionary"""
-        return {
-            'id': self.id,
-            'symbol': self.token_symbol,
-            'blockchain': self.blockchain,
-            'error_message': self.error_message,
-            'failed_at': self.failed_at.isoformat() if self.failed_at else None,
-            'retry_count': self.retry_count
-        }
-
+        data = self.to_dto()._asdict()
+        data['failed_at'] = isoformat_or_none(data['failed_at'])
+        return data
@@ -2,11 +2,26 @@
 SQLAlchemy model for pair_contracts table
 """
 from datetime import datetime
-from typing import Optional
+from operator import attrgetter
+from typing import NamedTuple, Optional
 from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
+from app.utils.serialization import isoformat_or_none
+
+
+class PairContractDTO(NamedTuple):
+    """Read-only snapshot of a pair_contracts row (what to_dict() returns, as a tuple)"""
+    id: int
+    pair: str
+    base_token_id: Optional[int]
+    quote_token_id: Optional[int]
+    blockchain: str
+    dex_name: Optional[str]
+    liquidity_usd: Optional[float]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
 
 
 class PairContract(Base):
@@ -25,9 +40,10 @@ class PairContract(Base):
     created_at = Column(DateTime, default=func.now(), nullable=False)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
 
-    # Relationships
-    base_token = relationship('ContractAddress', foreign_keys=[base_token_id], backref='base_pairs')
-    quote_token = relationship('ContractAddress', foreign_keys=[quote_token_id], backref='quote_pairs')
+    # Relationships (joined so a pair loads with both tokens in one SELECT;
+    # lazy loads are also unavailable under AsyncSession)
+    base_token = relationship('ContractAddress', foreign_keys=[base_token_id], backref='base_pairs', lazy='joined')
+    quote_token = relationship('ContractAddress', foreign_keys=[quote_token_id], backref='quote_pairs', lazy='joined')
 
     # Unique constraint on (pair_symbol, blockchain, dex_name)
     __table_args__ = (
@@ -41,17 +57,22 @@ class PairContract(Base):
     def __repr__(self):
         return f"<PairContract(pair={self.pair_symbol}, blockchain={self.blockchain}, dex={self.dex_name})>"
 
+    # Source of each PairContractDTO field; 'pair' is pair_symbol
+    _dict_values = attrgetter(
+        'id', 'pair_symbol', 'base_token_id', 'quote_token_id', 'blockchain', 'dex_name', 'liquidity_usd',
+        'created_at', 'updated_at'
+    )
+
+    def to_dto(self) -> PairContractDTO:
+        """Convert model to a lightweight tuple (datetimes left as-is)"""
+        dto = PairContractDTO._make(self._dict_values(self))
+        if dto.liquidity_usd is not None:
+            dto = dto._replace(liquidity_usd=float(dto.liquidity_usd))
+        return dto
+
     def to_dict(self) -> dict:
         """Convert model to dictionary"""
-        return {
-            'id': self.id,
-            'pair': self.pair_symbol,
-            'base_token_id': self.base_token_id,
-            'quote_token_id': self.quote_token_id,
-            'blockchain': self.blockchain,
-            'dex_name': self.dex_name,
-            'liquidity_usd': float(self.liquidity_usd) if self.liquidity_usd else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
-
+        data = self.to_dto()._asdict()
+        data['created_at'] = isoformat_or_none(data['created_at'])
+        data['updated_at'] = isoformat_or_none(data['updated_at'])
+        return data
@@ -2,10 +2,13 @@
 from .coingecko_client import CoinGeckoClient
 from .etherscan_client import EtherscanClient
 from .oneinch_client import OneInchClient
+from .http import get_session, close_session
 
 __all__ = [
     'CoinGeckoClient',
     'EtherscanClient',
-    'OneInchClient'
+    'OneInchClient',
+    'get_session',
+    'close_session'
 ]
 
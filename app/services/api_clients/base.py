@@ -0,0 +1,171 @@
+"""
+Shared request plumbing for the API clients
+"""
+import asyncio
+import logging
+import random
+from typing import Optional, Dict, Any, Hashable, Tuple
+
+from app.services.api_clients.http import (
+    HTTP2_AVAILABLE, TRANSPORT_ERRORS, get_session, get_http2_client, retry_after_seconds
+)
+from app.utils.rate_limiter import TokenBucketRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Error pages (WAF/HTML) can be large; only this much is read for the log
+ERROR_BODY_LIMIT = 512
+
+# Transient failures are retried with capped exponential backoff
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_ATTEMPTS = 4
+MAX_BACKOFF_SECONDS = 30.0
+
+# Token buckets keyed by (API name, scope): quotas are per API key, so all
+# client instances and methods using the same key draw from one bucket
+_limiters: Dict[Tuple[str, Hashable], TokenBucketRateLimiter] = {}
+
+
+class BaseApiClient:
+    """
+    Base class for the API clients: rate limiting, default headers and
+    GET requests over the shared session
+    """
+
+    API_NAME = 'API'
+    # Set on clients whose host supports HTTP/2; used when httpx[http2] is installed
+    HTTP2 = False
+
+    def __init__(
+        self,
+        rate_limit_delay: float,
+        headers: Optional[Dict[str, str]] = None,
+        limiter_scope: Hashable = None
+    ):
+        self.headers = headers or {}
+        self.rate_limit_delay = rate_limit_delay
+        # Shared by concurrent requests, unlike a per-call sleep
+        self._limiter = self._shared_limiter(limiter_scope)
+
+    def _shared_limiter(self, scope: Hashable) -> TokenBucketRateLimiter:
+        """
+        Get the process-wide token bucket for this API and scope (usually the API key)
+        """
+        key = (self.API_NAME, scope)
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = TokenBucketRateLimiter(
+                requests_per_minute=int(60 / self.rate_limit_delay),
+                burst=int(1 / self.rate_limit_delay)
+            )
+        return limiter
+
+    async def __aenter__(self):
+        """Async context manager entry"""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit (the shared session stays open)"""
+
+    async def _get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        limiter: Optional[TokenBucketRateLimiter] = None
+    ) -> Tuple[int, bytes]:
+        """
+        Rate-limited GET request, retrying 429/5xx responses and network errors
+
+        A 429 throttles the shared limiter for Retry-After seconds, so the
+        retry waits in acquire(); 5xx and network errors back off 1, 2, 4s.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            limiter: Token bucket to use instead of the client's default one
+
+        Returns:
+            (HTTP status, response body); the body is empty for non-200
+            responses, which are logged here
+
+        Raises:
+            The last network error once all attempts failed
+        """
+        limiter = limiter or self._limiter
+        for attempt in range(MAX_ATTEMPTS):
+            last_attempt = attempt == MAX_ATTEMPTS - 1
+            try:
+                status, body = await self._get_once(url, params, limiter)
+            except TRANSPORT_ERRORS as e:
+                if last_attempt:
+                    raise
+                delay = min(2 ** attempt, MAX_BACKOFF_SECONDS) * random.uniform(0.5, 1.5)
+                logger.warning(
+                    "%s request failed (%s), retrying in %.1fs",
+                    self.API_NAME, e.__class__.__name__, delay
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            if status not in RETRY_STATUSES or last_attempt:
+                return status, body
+            if status != 429:
+                await asyncio.sleep(min(2 ** attempt, MAX_BACKOFF_SECONDS))
+
+    async def _get_once(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        limiter: TokenBucketRateLimiter
+    ) -> Tuple[int, bytes]:
+        """Single rate-limited GET request (see _get)"""
+        await limiter.acquire()
+
+        if self.HTTP2 and HTTP2_AVAILABLE:
+            client = await get_http2_client()
+            async with client.stream('GET', url, params=params, headers=self.headers) as response:
+                if response.status_code == 200:
+                    return 200, await response.aread()
+                await self._log_error(response.status_code, response, limiter, lambda: self._read_prefix_httpx(response))
+                return response.status_code, b''
+
+        session = await get_session()
+        async with session.get(url, params=params, headers=self.headers) as response:
+            if response.status == 200:
+                return 200, await response.read()
+            await self._log_error(response.status, response, limiter, lambda: response.content.read(ERROR_BODY_LIMIT))
+            return response.status, b''
+
+    @staticmethod
+    async def _read_prefix_httpx(response) -> bytes:
+        """First ERROR_BODY_LIMIT bytes of a streamed httpx response"""
+        prefix = b''
+        async for chunk in response.aiter_bytes():
+            prefix += chunk
+            if len(prefix) >= ERROR_BODY_LIMIT:
+                break
+        return prefix[:ERROR_BODY_LIMIT]
+
+    async def _log_error(self, status: int, response, limiter: TokenBucketRateLimiter, read_prefix):
+        """
+        Handle a non-200 response: back off on 429, log other errors
+
+        Args:
+            status: HTTP status
+            response: aiohttp or httpx response (for headers)
+            limiter: Token bucket the request was made against
+            read_prefix: Returns an awaitable for the start of the body;
+                only called for 4xx errors worth logging
+        """
+        if status == 429:
+            limiter.throttle(min(retry_after_seconds(response), MAX_BACKOFF_SECONDS))
+            logger.warning("%s rate limit hit, backing off", self.API_NAME)
+        elif status >= 500:
+            # Don't read server error pages at all
+            logger.warning(
+                "%s API error %d (rate limit reset: %s)",
+                self.API_NAME, status, response.headers.get('X-RateLimit-Reset')
+            )
+        elif status != 404:
+            error_text = (await read_prefix()).decode('utf-8', 'replace')
+            logger.warning("%s API error %d: %s", self.API_NAME, status, error_text)
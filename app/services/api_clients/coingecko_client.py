@@ -2,26 +2,33 @@
 CoinGecko API client for fetching contract addresses
 """
 import os
-import time
 import asyncio
-import aiohttp
 import logging
-from typing import Optional, Dict, Any
-from datetime import datetime
+import orjson
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List
+
+from app.services.api_clients.base import BaseApiClient
+from app.services.api_clients import lookup_cache
 
 logger = logging.getLogger(__name__)
 
+# Shared stand-in for missing/null nested objects in API payloads
+_EMPTY = MappingProxyType({})
+
 
-class CoinGeckoClient:
+class CoinGeckoClient(BaseApiClient):
     """
     Client for CoinGecko API
     Free tier: 10-50 calls/minute (no API key required for basic)
     """
     
     BASE_URL = "https://api.coingecko.com/api/v3"
+    API_NAME = 'CoinGecko'
+    HTTP2 = True
     
     # Platform IDs mapping
-    PLATFORM_IDS = {
+    PLATFORM_IDS = MappingProxyType({
         'ethereum': 'ethereum',
         'bsc': 'binance-smart-chain',
         'polygon': 'polygon-pos',
@@ -32,27 +39,20 @@ class CoinGeckoClient:
         'base': 'base',
         'zksync': 'zksync',
         'scroll': 'scroll'
-    }
+    })
     
     def __init__(self):
         self.api_key = os.getenv('COINGECKO_API_KEY')
-        self.session: Optional[aiohttp.ClientSession] = None
-        self.rate_limit_delay = 0.1  # 10 calls/second default (no key)
-        
-    async def __aenter__(self):
-        """Async context manager entry"""
-        self.session = aiohttp.ClientSession()
-        return self
-        
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        super().__init__(
+            rate_limit_delay=0.1,  # 10 calls/second default (no key)
+            headers={'x-cg-demo-api-key': self.api_key} if self.api_key else None,
+            limiter_scope=self.api_key
+        )
     
     def _get_platform_id(self, blockchain: str) -> Optional[str]:
         """Convert blockchain name to CoinGecko platform ID"""
-        blockchain_lower = blockchain.lower()
-        return self.PLATFORM_IDS.get(blockchain_lower)
+        # Keys are lowercase; callers usually are too, so skip the .lower() copy
+        return self.PLATFORM_IDS.get(blockchain) or self.PLATFORM_IDS.get(blockchain.lower())
     
     async def get_contract_address(
         self, 
@@ -74,38 +74,49 @@ class CoinGeckoClient:
             logger.warning(f"Unsupported blockchain for CoinGecko: {blockchain}")
             return None
         
+        cache_key = ('coingecko', 'contract', platform_id, coin_id)
+        hit, cached = lookup_cache.get_cached(cache_key)
+        if hit:
+            return cached
+        
+        # Concurrent lookups of the same coin share one request
+        return await lookup_cache.single_flight(
+            cache_key,
+            lambda: self._fetch_contract_address(coin_id, blockchain, platform_id, cache_key)
+        )
+    
+    async def _fetch_contract_address(
+        self,
+        coin_id: str,
+        blockchain: str,
+        platform_id: str,
+        cache_key: tuple
+    ) -> Optional[Dict[str, Any]]:
+        """Uncached request behind get_contract_address"""
         endpoint = f"/coins/{coin_id}/contract/{platform_id}"
         url = f"{self.BASE_URL}{endpoint}"
         
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
-            
-            # Rate limiting
-            await asyncio.sleep(self.rate_limit_delay)
+            status, body = await self._get(url)
             
-            headers = {}
-            if self.api_key:
-                headers['x-cg-demo-api-key'] = self.api_key
-            
-            async with self.session.get(url, headers=headers, timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return {
-                        'contract_address': data.get('contract_address', '').lower(),
-                        'platform': data.get('platform', {}).get('id', blockchain),
-                        'name': data.get('name', ''),
-                        'symbol': data.get('symbol', '').upper(),
-                        'decimals': data.get('detail_platforms', {}).get(platform_id, {}).get('decimal_place'),
-                        'source': 'coingecko'
-                    }
-                elif response.status == 404:
-                    logger.debug(f"Coin {coin_id} not found on {blockchain} via CoinGecko")
-                    return None
-                else:
-                    error_text = await response.text()
-                    logger.warning(f"CoinGecko API error {response.status}: {error_text}")
-                    return None
+            if status == 200:
+                data = orjson.loads(body)
+                platform = data.get('platform') or _EMPTY
+                detail = (data.get('detail_platforms') or _EMPTY).get(platform_id) or _EMPTY
+                result = {
+                    'contract_address': (data.get('contract_address') or '').lower(),
+                    'platform': platform.get('id', blockchain),
+                    'name': data.get('name') or '',
+                    'symbol': (data.get('symbol') or '').upper(),
+                    'decimals': detail.get('decimal_place'),
+                    'source': 'coingecko'
+                }
+                lookup_cache.cache_result(cache_key, result)
+                return result
+            elif status == 404:
+                logger.debug(f"Coin {coin_id} not found on {blockchain} via CoinGecko")
+                lookup_cache.cache_not_found(cache_key)
+            return None
                     
         except asyncio.TimeoutError:
             logger.error(f"CoinGecko API timeout for {coin_id} on {blockchain}")
@@ -114,6 +125,56 @@ class CoinGeckoClient:
             logger.error(f"CoinGecko API error: {str(e)}")
             return None
     
+    async def get_contract_addresses_batch(
+        self,
+        coin_ids: List[str],
+        blockchain: str,
+        concurrency: int = 5
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get contract addresses for several coins concurrently
+        
+        Args:
+            coin_ids: CoinGecko coin IDs
+            blockchain: Blockchain name (e.g., 'ethereum', 'bsc')
+            concurrency: Maximum requests in flight
+            
+        Returns:
+            Mapping of coin ID to contract info (None if not found)
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch_one(coin_id: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self.get_contract_address(coin_id, blockchain)
+        
+        # Duplicates would all miss the lookup cache concurrently; fetch each once
+        unique_ids = list(dict.fromkeys(coin_ids))
+        results = await asyncio.gather(*(fetch_one(coin_id) for coin_id in unique_ids))
+        return dict(zip(unique_ids, results))
+    
+    async def get_contract_addresses_multi_chain(
+        self,
+        coin_id: str
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get a coin's contract address on every supported chain concurrently
+        
+        The shared rate limiter paces the requests, so this costs roughly
+        len(PLATFORM_IDS) / rate seconds instead of one round trip per chain.
+        
+        Args:
+            coin_id: CoinGecko coin ID
+            
+        Returns:
+            Mapping of blockchain name to contract info (None if not found)
+        """
+        chains = list(self.PLATFORM_IDS)
+        results = await asyncio.gather(
+            *(self.get_contract_address(coin_id, chain) for chain in chains)
+        )
+        return dict(zip(chains, results))
+    
     async def search_coin(self, query: str) -> Optional[str]:
         """
         Search for coin ID by symbol or name
@@ -124,27 +185,26 @@ class CoinGeckoClient:
         Returns:
             CoinGecko coin ID or None if not found
         """
+        cache_key = ('coingecko', 'search', None, query.lower())
+        hit, cached = lookup_cache.get_cached(cache_key)
+        if hit:
+            return cached
+        
         url = f"{self.BASE_URL}/search"
         params = {'query': query}
         
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
-            
-            await asyncio.sleep(self.rate_limit_delay)
+            status, body = await self._get(url, params=params)
             
-            headers = {}
-            if self.api_key:
-                headers['x-cg-demo-api-key'] = self.api_key
-            
-            async with self.session.get(url, params=params, headers=headers, timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    coins = data.get('coins', [])
-                    if coins:
-                        # Return first match (usually most relevant)
-                        return coins[0].get('id')
-                return None
+            if status == 200:
+                coins = orjson.loads(body).get('coins', [])
+                if coins:
+                    # Return first match (usually most relevant)
+                    coin_id = coins[0].get('id')
+                    lookup_cache.cache_result(cache_key, coin_id)
+                    return coin_id
+                lookup_cache.cache_not_found(cache_key)
+            return None
                 
         except Exception as e:
             logger.error(f"CoinGecko search error: {str(e)}")
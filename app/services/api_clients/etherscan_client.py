@@ -2,23 +2,31 @@
 Etherscan/BSCScan/PolygonScan API client for fetching contract addresses
 """
 import os
-import time
+import re
 import asyncio
-import aiohttp
 import logging
+import orjson
+from types import MappingProxyType
 from typing import Optional, Dict, Any
-from datetime import datetime
+
+from app.services.api_clients.base import BaseApiClient
+from app.services.api_clients import lookup_cache
 
 logger = logging.getLogger(__name__)
 
+# symbol = "USDT" / symbol: 'USDT' in verified source code
+_SYMBOL_RE = re.compile(r'symbol\s*[:=]\s*["\']([^"\']+)["\']', re.IGNORECASE)
+
 
-class EtherscanClient:
+class EtherscanClient(BaseApiClient):
     """
     Client for Etherscan-family APIs (Etherscan, BSCScan, PolygonScan)
     Free tier: 5 calls/second (with API key)
     """
     
-    BASE_URLS = {
+    API_NAME = 'Etherscan'
+    
+    BASE_URLS = MappingProxyType({
         'ethereum': 'https://api.etherscan.io/api',
         'bsc': 'https://api.bscscan.com/api',
         'polygon': 'https://api.polygonscan.com/api',
@@ -27,9 +35,9 @@ class EtherscanClient:
         'avalanche': 'https://api.snowtrace.io/api',
         'fantom': 'https://api.ftmscan.com/api',
         'base': 'https://api.basescan.org/api'
-    }
+    })
     
-    API_KEY_ENV_VARS = {
+    API_KEY_ENV_VARS = MappingProxyType({
         'ethereum': 'ETHERSCAN_API_KEY',
         'bsc': 'BSCSCAN_API_KEY',
         'polygon': 'POLYGONSCAN_API_KEY',
@@ -38,34 +46,27 @@ class EtherscanClient:
         'avalanche': 'SNOWTRACE_API_KEY',
         'fantom': 'FTMSCAN_API_KEY',
         'base': 'BASESCAN_API_KEY'
-    }
+    })
     
     def __init__(self):
-        self.session: Optional[aiohttp.ClientSession] = None
-        self.rate_limit_delay = 0.2  # 5 calls/second
-        
-    async def __aenter__(self):
-        """Async context manager entry"""
-        self.session = aiohttp.ClientSession()
-        return self
-        
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        # Read once, like the other clients' API keys
+        self._api_keys = {chain: os.getenv(env_var) for chain, env_var in self.API_KEY_ENV_VARS.items()}
+        # Constant part of the getsourcecode query, per chain with a key
+        self._params_templates = {
+            chain: MappingProxyType({'module': 'contract', 'action': 'getsourcecode', 'apikey': api_key})
+            for chain, api_key in self._api_keys.items() if api_key
+        }
+        # 5 calls/second per API key; each chain's explorer has its own key
+        super().__init__(rate_limit_delay=0.2)
     
     def _get_base_url(self, blockchain: str) -> Optional[str]:
         """Get base URL for blockchain"""
-        blockchain_lower = blockchain.lower()
-        return self.BASE_URLS.get(blockchain_lower)
+        # Keys are lowercase; callers usually are too, so skip the .lower() copy
+        return self.BASE_URLS.get(blockchain) or self.BASE_URLS.get(blockchain.lower())
     
-    def _get_api_key(self, blockchain: str) -> Optional[str]:
-        """Get API key for blockchain"""
-        blockchain_lower = blockchain.lower()
-        env_var = self.API_KEY_ENV_VARS.get(blockchain_lower)
-        if env_var:
-            return os.getenv(env_var)
-        return None
+    def _get_params_template(self, blockchain: str) -> Optional[MappingProxyType]:
+        """Get the getsourcecode query template for blockchain (None without an API key)"""
+        return self._params_templates.get(blockchain) or self._params_templates.get(blockchain.lower())
     
     async def get_contract_info(
         self, 
@@ -87,56 +88,77 @@ class EtherscanClient:
             logger.warning(f"Unsupported blockchain for Etherscan: {blockchain}")
             return None
         
-        api_key = self._get_api_key(blockchain)
-        if not api_key:
+        params_template = self._get_params_template(blockchain)
+        if not params_template:
             logger.debug(f"No API key for {blockchain} scan API")
             return None
         
-        params = {
-            'module': 'contract',
-            'action': 'getsourcecode',
-            'address': contract_address,
-            'apikey': api_key
-        }
+        cache_key = ('etherscan', 'contract', blockchain.lower(), contract_address.lower())
+        hit, cached = lookup_cache.get_cached(cache_key)
+        if hit:
+            return cached
+        
+        # Concurrent lookups of the same contract share one request
+        return await lookup_cache.single_flight(
+            cache_key,
+            lambda: self._fetch_contract_info(contract_address, blockchain, base_url, params_template, cache_key)
+        )
+    
+    async def _fetch_contract_info(
+        self,
+        contract_address: str,
+        blockchain: str,
+        base_url: str,
+        params_template: MappingProxyType,
+        cache_key: tuple
+    ) -> Optional[Dict[str, Any]]:
+        """Uncached request behind get_contract_info"""
+        params = {**params_template, 'address': contract_address}
+        limiter = self._shared_limiter(params_template['apikey'])
         
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
-            
-            await asyncio.sleep(self.rate_limit_delay)
+            status, body = await self._get(base_url, params=params, limiter=limiter)
             
-            async with self.session.get(base_url, params=params, timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data.get('status') == '1' and data.get('result'):
-                        result = data['result'][0]
-                        
-                        # Try to extract name and symbol from ABI or contract name
-                        contract_name = result.get('ContractName', '')
-                        source_code = result.get('SourceCode', '')
-                        
-                        # Basic parsing (can be enhanced)
-                        name = contract_name or ''
-                        symbol = ''
-                        decimals = 18  # Default
-                        
-                        # Try to extract from source code if available
-                        if source_code and 'symbol' in source_code.lower():
-                            # Simple extraction (not perfect, but works for common cases)
-                            import re
-                            symbol_match = re.search(r'symbol\s*[:=]\s*["\']([^"\']+)["\']', source_code, re.IGNORECASE)
-                            if symbol_match:
-                                symbol = symbol_match.group(1).upper()
-                        
-                        return {
-                            'contract_address': contract_address.lower(),
-                            'name': name,
-                            'symbol': symbol,
-                            'decimals': decimals,
-                            'verified': result.get('Proxy', '0') == '0' and bool(source_code),
-                            'source': f'{blockchain}scan'
-                        }
-                return None
+            if status == 200:
+                data = orjson.loads(body)
+                # Etherscan reports rate limiting as status 0 with HTTP 200
+                if data.get('status') == '0' and 'rate limit' in str(data.get('result', '')).lower():
+                    limiter.throttle(1.0)
+                    logger.warning("Etherscan rate limit hit, backing off")
+                    return None
+                if data.get('status') == '1' and data.get('result'):
+                    result = data['result'][0]
+                    
+                    # Try to extract name and symbol from ABI or contract name
+                    contract_name = result.get('ContractName', '')
+                    source_code = result.get('SourceCode', '')
+                    
+                    # Basic parsing (can be enhanced)
+                    name = contract_name or ''
+                    symbol = ''
+                    decimals = 18  # Default
+                    
+                    # Try to extract from source code if available
+                    # (simple extraction, not perfect, but works for common cases)
+                    # The substring tests skip the much slower case-insensitive
+                    # regex scan for sources that never mention a symbol
+                    if source_code and ('symbol' in source_code or 'Symbol' in source_code
+                                        or 'SYMBOL' in source_code):
+                        symbol_match = _SYMBOL_RE.search(source_code)
+                        if symbol_match:
+                            symbol = symbol_match.group(1).upper()
+                    
+                    contract_info = {
+                        'contract_address': contract_address.lower(),
+                        'name': name,
+                        'symbol': symbol,
+                        'decimals': decimals,
+                        'verified': result.get('Proxy', '0') == '0' and bool(source_code),
+                        'source': f'{blockchain}scan'
+                    }
+                    lookup_cache.cache_result(cache_key, contract_info)
+                    return contract_info
+            return None
                 
         except asyncio.TimeoutError:
             logger.error(f"Etherscan API timeout for {contract_address} on {blockchain}")
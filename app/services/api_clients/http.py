@@ -0,0 +1,120 @@
+"""
+Shared aiohttp session for the API clients
+
+One pooled session (keep-alive connections, cached DNS) is reused by
+CoinGecko, Etherscan and 1inch instead of each client opening its own and
+paying a TCP/TLS handshake per context manager. The per-host connection cap
+therefore applies across all clients. Client context managers don't own
+the session: call close_session() once at process shutdown.
+
+Hosts that speak HTTP/2 (CoinGecko, 1inch) can instead go through a shared
+httpx client, which multiplexes concurrent requests over one connection per
+host. That backend is optional and used only when httpx[http2] is installed.
+"""
+import os
+import asyncio
+import aiohttp
+from typing import Optional
+
+try:
+    import aiodns  # noqa: F401  (backs aiohttp.AsyncResolver)
+    AIODNS_AVAILABLE = True
+except ImportError:
+    AIODNS_AVAILABLE = False
+
+try:
+    import httpx
+    import h2  # noqa: F401  (required by httpx for http2=True)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Connection-level failures worth retrying (timeouts, resets, DNS errors)
+TRANSPORT_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+if HTTP2_AVAILABLE:
+    TRANSPORT_ERRORS += (httpx.TransportError,)
+
+# Optional comma-separated nameservers for the aiodns resolver (default: system config)
+DNS_NAMESERVERS = [ns.strip() for ns in os.getenv('DNS_NAMESERVERS', '').split(',') if ns.strip()]
+
+_session: Optional[aiohttp.ClientSession] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_http2_client: Optional['httpx.AsyncClient'] = None
+_http2_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """
+    Get the shared session, creating it on first use per event loop
+    """
+    global _session, _loop
+
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or loop is not _loop:
+        # aiodns resolves on the event loop; the fallback resolver uses
+        # getaddrinfo in the default thread pool
+        resolver = None
+        if AIODNS_AVAILABLE:
+            resolver = aiohttp.AsyncResolver(nameservers=DNS_NAMESERVERS or None)
+        connector = aiohttp.TCPConnector(
+            resolver=resolver,
+            limit=100,
+            limit_per_host=10,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+            enable_cleanup_closed=True
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=10, connect=3)
+        )
+        _loop = loop
+    return _session
+
+
+async def get_http2_client() -> 'httpx.AsyncClient':
+    """
+    Get the shared HTTP/2 client, creating it on first use per event loop
+    (only call when HTTP2_AVAILABLE)
+    """
+    global _http2_client, _http2_loop
+
+    loop = asyncio.get_running_loop()
+    if _http2_client is None or _http2_client.is_closed or loop is not _http2_loop:
+        _http2_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=httpx.Timeout(10.0, connect=3.0)
+        )
+        _http2_loop = loop
+    return _http2_client
+
+
+def retry_after_seconds(response, default: float = 1.0) -> float:
+    """
+    Seconds to wait from a 429 response's Retry-After header (numeric form only)
+
+    Works with both aiohttp and httpx responses.
+    """
+    try:
+        return float(response.headers.get('Retry-After', default))
+    except ValueError:
+        return default
+
+
+async def close_session():
+    """
+    Close the shared session and HTTP/2 client (call on shutdown)
+    """
+    global _session, _loop, _http2_client, _http2_loop
+
+    loop = asyncio.get_running_loop()
+    if _session is not None and not _session.closed and _loop is loop:
+        await _session.close()
+    _session = None
+    _loop = None
+
+    if _http2_client is not None and not _http2_client.is_closed and _http2_loop is loop:
+        await _http2_client.aclose()
+    _http2_client = None
+    _http2_loop = None
@@ -0,0 +1,81 @@
+"""
+In-process TTL cache for API client lookups
+
+Keys are (source, method, blockchain, query). Found results live for an
+hour; definitive "not found" answers (404, empty search) for five minutes.
+Errors and timeouts are never cached. No lock is needed: reads and writes
+happen without an await in between.
+
+Concurrent misses for the same key are coalesced by single_flight() into
+one request.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+from cachetools import TTLCache
+
+_results = TTLCache(maxsize=10_000, ttl=3600)
+_not_found = TTLCache(maxsize=10_000, ttl=300)
+
+_inflight: Dict[Hashable, asyncio.Task] = {}
+
+_MISSING = object()
+
+
+def _copy(value: Any) -> Any:
+    """Shallow-copy dicts (and lists of dicts) so callers can't mutate cached entries"""
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, list):
+        return [dict(item) if isinstance(item, dict) else item for item in value]
+    return value
+
+
+def get_cached(key: Hashable) -> Tuple[bool, Any]:
+    """
+    Look up a cached result
+
+    Returns:
+        (True, value) on a hit, (False, None) on a miss
+    """
+    value = _results.get(key, _MISSING)
+    if value is _MISSING:
+        value = _not_found.get(key, _MISSING)
+    if value is _MISSING:
+        return False, None
+    return True, _copy(value)
+
+
+def cache_result(key: Hashable, value: Any):
+    """Cache a successful lookup"""
+    _results[key] = _copy(value)
+
+
+def cache_not_found(key: Hashable, value: Any = None):
+    """Cache a definitive negative answer with the shorter TTL"""
+    _not_found[key] = _copy(value)
+
+
+async def single_flight(key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run fetch() once for all concurrent callers with the same key
+
+    The fetch runs as its own task, so a cancelled caller does not cancel it
+    for the others. Each caller gets its own copy of the result.
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return _copy(await asyncio.shield(task))
+
+
+def in_flight(key: Hashable) -> bool:
+    """Whether a single_flight() fetch for key is running (a call now would join it)"""
+    return key in _inflight
+
+
+def clear():
+    """Drop all cached lookups"""
+    _results.clear()
+    _not_found.clear()
@@ -2,26 +2,30 @@
 1inch API client for fetching contract addresses
 """
 import os
-import time
 import asyncio
-import aiohttp
 import logging
+import orjson
+from types import MappingProxyType
 from typing import Optional, Dict, Any, List
-from datetime import datetime
+
+from app.services.api_clients.base import BaseApiClient
+from app.services.api_clients import lookup_cache
 
 logger = logging.getLogger(__name__)
 
 
-class OneInchClient:
+class OneInchClient(BaseApiClient):
     """
     Client for 1inch API
     Free tier: Good rate limits, no key required for basic
     """
     
     BASE_URL = "https://api.1inch.dev"
+    API_NAME = '1inch'
+    HTTP2 = True
     
     # Chain IDs mapping
-    CHAIN_IDS = {
+    CHAIN_IDS = MappingProxyType({
         'ethereum': 1,
         'bsc': 56,
         'polygon': 137,
@@ -32,30 +36,20 @@ class OneInchClient:
         'base': 8453,
         'zksync': 324,
         'scroll': 534352
-    }
+    })
     
     def __init__(self):
         self.api_key = os.getenv('ONEINCH_API_KEY')
-        self.session: Optional[aiohttp.ClientSession] = None
-        self.rate_limit_delay = 0.1  # 10 calls/second
-        
-    async def __aenter__(self):
-        """Async context manager entry"""
-        headers = {}
-        if self.api_key:
-            headers['Authorization'] = f'Bearer {self.api_key}'
-        self.session = aiohttp.ClientSession(headers=headers)
-        return self
-        
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        super().__init__(
+            rate_limit_delay=0.1,  # 10 calls/second
+            headers={'Authorization': f'Bearer {self.api_key}'} if self.api_key else None,
+            limiter_scope=self.api_key
+        )
     
     def _get_chain_id(self, blockchain: str) -> Optional[int]:
         """Convert blockchain name to 1inch chain ID"""
-        blockchain_lower = blockchain.lower()
-        return self.CHAIN_IDS.get(blockchain_lower)
+        # Keys are lowercase; callers usually are too, so skip the .lower() copy
+        return self.CHAIN_IDS.get(blockchain) or self.CHAIN_IDS.get(blockchain.lower())
     
     async def search_tokens(
         self, 
@@ -79,41 +73,54 @@ class OneInchClient:
             logger.warning(f"Unsupported blockchain for 1inch: {blockchain}")
             return []
         
+        cache_key = ('1inch', 'search', chain_id, query.lower(), limit)
+        hit, cached = lookup_cache.get_cached(cache_key)
+        if hit:
+            return cached
+        
+        # Concurrent identical searches share one request
+        return await lookup_cache.single_flight(
+            cache_key,
+            lambda: self._fetch_search(query, blockchain, chain_id, limit, cache_key)
+        )
+    
+    async def _fetch_search(
+        self,
+        query: str,
+        blockchain: str,
+        chain_id: int,
+        limit: int,
+        cache_key: tuple
+    ) -> List[Dict[str, Any]]:
+        """Uncached request behind search_tokens"""
         endpoint = f"/token/v1.2/{chain_id}/search"
         url = f"{self.BASE_URL}{endpoint}"
         params = {'query': query, 'limit': limit}
         
         try:
-            if not self.session:
-                headers = {}
-                if self.api_key:
-                    headers['Authorization'] = f'Bearer {self.api_key}'
-                self.session = aiohttp.ClientSession(headers=headers)
-            
-            await asyncio.sleep(self.rate_limit_delay)
+            status, body = await self._get(url, params=params)
             
-            async with self.session.get(url, params=params, timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    tokens = data.get('tokens', [])
-                    
-                    results = []
-                    for token in tokens:
-                        results.append({
-                            'contract_address': token.get('address', '').lower(),
-                            'symbol': token.get('symbol', '').upper(),
-                            'name': token.get('name', ''),
-                            'decimals': token.get('decimals', 18),
-                            'source': '1inch'
-                        })
-                    return results
-                elif response.status == 404:
-                    logger.debug(f"No tokens found for '{query}' on {blockchain} via 1inch")
-                    return []
+            if status == 200:
+                tokens = orjson.loads(body).get('tokens', [])
+                
+                results = []
+                for token in tokens:
+                    results.append({
+                        'contract_address': token.get('address', '').lower(),
+                        'symbol': token.get('symbol', '').upper(),
+                        'name': token.get('name', ''),
+                        'decimals': token.get('decimals', 18),
+                        'source': '1inch'
+                    })
+                if results:
+                    lookup_cache.cache_result(cache_key, results)
                 else:
-                    error_text = await response.text()
-                    logger.warning(f"1inch API error {response.status}: {error_text}")
-                    return []
+                    lookup_cache.cache_not_found(cache_key, results)
+                return results
+            elif status == 404:
+                logger.debug(f"No tokens found for '{query}' on {blockchain} via 1inch")
+                lookup_cache.cache_not_found(cache_key, [])
+            return []
                     
         except asyncio.TimeoutError:
             logger.error(f"1inch API timeout for {query} on {blockchain}")
@@ -122,6 +129,27 @@ class OneInchClient:
             logger.error(f"1inch API error: {str(e)}")
             return []
     
+    async def search_tokens_multi_chain(
+        self,
+        query: str,
+        limit: int = 10
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Search for tokens on every supported chain concurrently
+        
+        Args:
+            query: Token symbol or name
+            limit: Maximum number of results per chain
+            
+        Returns:
+            Mapping of blockchain name to token list
+        """
+        chains = list(self.CHAIN_IDS)
+        results = await asyncio.gather(
+            *(self.search_tokens(query, chain, limit) for chain in chains)
+        )
+        return dict(zip(chains, results))
+    
     async def get_token_info(
         self, 
         contract_address: str, 
@@ -143,29 +171,29 @@ class OneInchClient:
         
         # 1inch doesn't have a direct token info endpoint
         # We can use the token list endpoint and filter
+        cache_key = ('1inch', 'token', chain_id, contract_address.lower())
+        hit, cached = lookup_cache.get_cached(cache_key)
+        if hit:
+            return cached
+        
         endpoint = f"/token/v1.2/{chain_id}/token/{contract_address}"
         url = f"{self.BASE_URL}{endpoint}"
         
         try:
-            if not self.session:
-                headers = {}
-                if self.api_key:
-                    headers['Authorization'] = f'Bearer {self.api_key}'
-                self.session = aiohttp.ClientSession(headers=headers)
-            
-            await asyncio.sleep(self.rate_limit_delay)
+            status, body = await self._get(url)
             
-            async with self.session.get(url, timeout=10) as response:
-                if response.status == 200:
-                    token = await response.json()
-                    return {
-                        'contract_address': contract_address.lower(),
-                        'symbol': token.get('symbol', '').upper(),
-                        'name': token.get('name', ''),
-                        'decimals': token.get('decimals', 18),
-                        'source': '1inch'
-                    }
-                return None
+            if status == 200:
+                token = orjson.loads(body)
+                token_info = {
+                    'contract_address': contract_address.lower(),
+                    'symbol': token.get('symbol', '').upper(),
+                    'name': token.get('name', ''),
+                    'decimals': token.get('decimals', 18),
+                    'source': '1inch'
+                }
+                lookup_cache.cache_result(cache_key, token_info)
+                return token_info
+            return None
                 
         except Exception as e:
             logger.error(f"1inch token info error: {str(e)}")
@@ -6,18 +6,25 @@ import os
 import time
 import asyncio
 import logging
+import orjson
+from types import MappingProxyType
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from cachetools import TLRUCache
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.contract_address import ContractAddress
 from app.models.pair_contract import PairContract
 from app.models.failed_lookup import FailedContractLookup
+from app.models.api_call_log_hourly import ApiCallLogHourly
+from app.database import upsert_insert
 from app.utils.contract_cache import ContractCache
 from app.utils.rate_limiter import RateLimiterManager
 from app.services.api_clients.coingecko_client import CoinGeckoClient
 from app.services.api_clients.etherscan_client import EtherscanClient
 from app.services.api_clients.oneinch_client import OneInchClient
+from app.services.api_clients.http import get_session
 
 # Fallback to DexScreener if available
 try:
@@ -28,6 +35,41 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Symbols no API could resolve: (SYMBOL, blockchain) -> retry_count. They are
+# not looked up again for 30s per recorded failure, at most 5 minutes
+FAILED_LOOKUP_BACKOFF_SECONDS = 30
+FAILED_LOOKUP_MAX_BACKOFF_SECONDS = 300
+_recent_failures = TLRUCache(
+    maxsize=8192,
+    ttu=lambda _key, retry_count, now: now + min(
+        FAILED_LOOKUP_MAX_BACKOFF_SECONDS, FAILED_LOOKUP_BACKOFF_SECONDS * retry_count
+    )
+)
+
+# One DexScreener client per process (its rate limiter, circuit breaker and
+# response cache are shared), on the shared HTTP session
+_dexscreener = None
+
+
+async def _get_dexscreener():
+    """Get the process-wide DexScreenerClient bound to the shared session"""
+    global _dexscreener
+    if _dexscreener is None:
+        _dexscreener = DexScreenerClient()
+    # get_session() replaces the session after close_session()
+    _dexscreener.session = await get_session()
+    return _dexscreener
+
+# Hardcoded contracts of the most-traded tokens, answered without the cache
+# or the APIs: (SYMBOL, blockchain) -> {'contract', 'decimals', 'name'}
+_WELL_KNOWN_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'well_known_tokens.json')
+with open(_WELL_KNOWN_PATH, 'rb') as _f:
+    WELL_KNOWN = MappingProxyType({
+        (symbol, blockchain): MappingProxyType(token)
+        for blockchain, tokens in orjson.loads(_f.read()).items()
+        for symbol, token in tokens.items()
+    })
+
 
 class ContractResolver:
     """
@@ -46,8 +88,14 @@ class ContractResolver:
         'optimism': 'ETH',
         'base': 'ETH'
     }
+    # (blockchain, symbol) pairs of NATIVE_TOKENS: one hash lookup per check
+    NATIVE_PAIRS = frozenset(NATIVE_TOKENS.items())
     
-    def __init__(self, db_session: Session):
+    # Head start per priority rank, so a faster lower-priority API only wins
+    # when the preferred one is slow or fails
+    PROVIDER_HEAD_START_SECONDS = 0.05
+    
+    def __init__(self, db_session: AsyncSession):
         self.db = db_session
         self.cache = ContractCache(db_session, cache_ttl_seconds=int(os.getenv('CONTRACT_CACHE_TTL', 86400)))
         self.rate_limiter = RateLimiterManager()
@@ -87,7 +135,7 @@ class ContractResolver:
                 'blockchain': str,
                 'decimals': int,
                 'name': str,
-                'source': str  # 'cache' or 'api'
+                'source': str  # 'native', 'wellknown', 'cache' or 'api'
             }
         """
         self.metrics['total_requests'] += 1
@@ -95,30 +143,25 @@ class ContractResolver:
         blockchain = blockchain.lower()
         
         # Check if native token
-        if blockchain in self.NATIVE_TOKENS and token_symbol == self.NATIVE_TOKENS[blockchain]:
-            return {
-                'symbol': token_symbol,
-                'contract': None,  # Native token
-                'blockchain': blockchain,
-                'decimals': 18,
-                'name': token_symbol,
-                'source': 'native'
-            }
+        if self._is_native(token_symbol, blockchain):
+            return self._native_result(token_symbol, blockchain)
         
-        # Check cache first (unless force refresh)
+        # Check the well-known tokens, then the cache (unless force refresh)
         if not force_refresh:
-            cached = self.cache.get_cached_contract(token_symbol, blockchain)
+            well_known = self._well_known_result(token_symbol, blockchain)
+            if well_known:
+                return well_known
+            
+            # Failed recently: don't spend API quota on a likely miss again
+            if (token_symbol, blockchain) in _recent_failures:
+                raise ValueError(
+                    f"Could not resolve contract address for {token_symbol} on {blockchain} (failed recently)"
+                )
+            
+            cached = await self.cache.get_cached_contract(token_symbol, blockchain)
             if cached:
                 self.metrics['cache_hits'] += 1
-                return {
-                    'symbol': cached.token_symbol,
-                    'contract': cached.contract_address,
-                    'blockchain': cached.blockchain,
-                    'decimals': cached.decimals or 18,
-                    'name': cached.token_name or token_symbol,
-                    'source': 'cache',
-                    'verified': cached.verified
-                }
+                return self._cached_result(cached, token_symbol)
         
         # Cache miss - fetch from APIs
         self.metrics['cache_misses'] += 1
@@ -127,23 +170,16 @@ class ContractResolver:
         if contract_data:
             # Save to cache
             try:
-                saved_contract = self.cache.save_contract({
-                    'symbol': token_symbol,
-                    'contract': contract_data['contract'],
-                    'blockchain': blockchain,
-                    'decimals': contract_data.get('decimals', 18),
-                    'name': contract_data.get('name', token_symbol),
-                    'verified': contract_data.get('verified', False)
-                })
+                await self.cache.save_contract(self._cache_entry(token_symbol, blockchain, contract_data))
                 contract_data['source'] = 'api'
                 return contract_data
             except Exception as e:
-                logger.error(f"Error saving contract to cache: {e}")
+                logger.error("Error saving contract to cache: %s", e)
                 contract_data['source'] = 'api'
                 return contract_data
         else:
             # All APIs failed - log failure
-            await self._log_failed_lookup(token_symbol, blockchain, "All APIs failed")
+            await self._log_failed_lookups([token_symbol], blockchain, "All APIs failed")
             raise ValueError(f"Could not resolve contract address for {token_symbol} on {blockchain}")
     
     async def get_pair_contracts(
@@ -174,53 +210,229 @@ class ContractResolver:
         
         base_symbol, quote_symbol = parts[0].upper(), parts[1].upper()
         
-        # Get contracts for both tokens
-        base_token = await self.get_contract_address(base_symbol, blockchain)
-        quote_token = await self.get_contract_address(quote_symbol, blockchain)
+        # Get contracts for both tokens (one cache query, misses fetched concurrently)
+        contracts = await self.get_contract_addresses([base_symbol, quote_symbol], blockchain)
+        for symbol in (base_symbol, quote_symbol):
+            if contracts[symbol] is None:
+                raise ValueError(f"Could not resolve contract address for {symbol} on {blockchain.lower()}")
         
         return {
             'pair': pair,
-            'base_token': base_token,
-            'quote_token': quote_token,
+            'base_token': contracts[base_symbol],
+            'quote_token': contracts[quote_symbol],
             'blockchain': blockchain
         }
     
+    async def get_contract_addresses(
+        self,
+        token_symbols: List[str],
+        blockchain: str = "ethereum",
+        concurrency: int = 5
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get contract addresses for several token symbols at once
+        
+        Cache hits come from a single query; misses are fetched from the
+        APIs concurrently and saved with a single commit.
+        
+        Args:
+            token_symbols: Token symbols (duplicates are resolved once)
+            blockchain: Blockchain name
+            concurrency: Maximum symbols fetched from the APIs at a time
+            
+        Returns:
+            Mapping of uppercase symbol to contract information (same shape
+            as get_contract_address), None for symbols that could not be resolved
+        """
+        blockchain = blockchain.lower()
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in token_symbols))
+        self.metrics['total_requests'] += len(symbols)
+        
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        for symbol in symbols:
+            if self._is_native(symbol, blockchain):
+                results[symbol] = self._native_result(symbol, blockchain)
+            else:
+                well_known = self._well_known_result(symbol, blockchain)
+                if well_known:
+                    results[symbol] = well_known
+        pending = []
+        for symbol in symbols:
+            if symbol in results:
+                continue
+            if (symbol, blockchain) in _recent_failures:
+                results[symbol] = None  # Failed recently, don't ask the APIs again yet
+            else:
+                pending.append(symbol)
+        
+        cached = await self.cache.get_cached_contracts_bulk(pending, blockchain)
+        for symbol, row in cached.items():
+            results[symbol] = self._cached_result(row, symbol)
+        self.metrics['cache_hits'] += len(cached)
+        
+        misses = [symbol for symbol in pending if symbol not in cached]
+        self.metrics['cache_misses'] += len(misses)
+        if misses:
+            semaphore = asyncio.Semaphore(concurrency)
+            
+            async def fetch_one(symbol: str) -> Optional[Dict[str, Any]]:
+                async with semaphore:
+                    return await self._fetch_from_apis(symbol, blockchain)
+            
+            fetched = await asyncio.gather(*(fetch_one(symbol) for symbol in misses))
+            
+            to_save = []
+            failed = []
+            for symbol, contract_data in zip(misses, fetched):
+                if contract_data:
+                    contract_data['source'] = 'api'
+                    to_save.append(self._cache_entry(symbol, blockchain, contract_data))
+                else:
+                    failed.append(symbol)
+                results[symbol] = contract_data
+            
+            # Uses the DB session, so it stays out of the concurrent fetches
+            await self._log_failed_lookups(failed, blockchain, "All APIs failed")
+            try:
+                await self.cache.save_contracts(to_save)
+            except Exception as e:
+                logger.error("Error saving contracts to cache: %s", e)
+        
+        return {symbol: results[symbol] for symbol in symbols}
+    
+    def _is_native(self, token_symbol: str, blockchain: str) -> bool:
+        """Whether the symbol is the chain's native token (no contract address)"""
+        return (blockchain, token_symbol) in self.NATIVE_PAIRS
+    
+    @staticmethod
+    def _native_result(token_symbol: str, blockchain: str) -> Dict[str, Any]:
+        """Result for a native token"""
+        return {
+            'symbol': token_symbol,
+            'contract': None,  # Native token
+            'blockchain': blockchain,
+            'decimals': 18,
+            'name': token_symbol,
+            'source': 'native'
+        }
+    
+    @staticmethod
+    def _well_known_result(token_symbol: str, blockchain: str) -> Optional[Dict[str, Any]]:
+        """Result for a token in WELL_KNOWN, None for other tokens"""
+        token = WELL_KNOWN.get((token_symbol, blockchain))
+        if token is None:
+            return None
+        return {
+            'symbol': token_symbol,
+            'contract': token['contract'],
+            'blockchain': blockchain,
+            'decimals': token['decimals'],
+            'name': token['name'],
+            'source': 'wellknown',
+            'verified': True
+        }
+    
+    @staticmethod
+    def _cached_result(cached, token_symbol: str) -> Dict[str, Any]:
+        """Result for a cache row"""
+        return {
+            'symbol': cached.token_symbol,
+            'contract': cached.contract_address,
+            'blockchain': cached.blockchain,
+            'decimals': cached.decimals or 18,
+            'name': cached.token_name or token_symbol,
+            'source': 'cache',
+            'verified': cached.verified
+        }
+    
+    @staticmethod
+    def _cache_entry(token_symbol: str, blockchain: str, contract_data: Dict[str, Any]) -> Dict[str, Any]:
+        """ContractCache.save_contract() input for an API result"""
+        return {
+            'symbol': token_symbol,
+            'contract': contract_data['contract'],
+            'blockchain': blockchain,
+            'decimals': contract_data.get('decimals', 18),
+            'name': contract_data.get('name', token_symbol),
+            'verified': contract_data.get('verified', False)
+        }
+    
     async def _fetch_from_apis(
         self,
         token_symbol: str,
         blockchain: str
     ) -> Optional[Dict[str, Any]]:
         """
-        Try APIs in sequence until successful
+        Query the APIs concurrently and return the first successful result
         
-        Priority order:
+        Priority order (each starts PROVIDER_HEAD_START_SECONDS after the previous):
         1. CoinGecko
         2. 1inch
-        3. Etherscan (if we have contract address from other sources)
-        4. DexScreener (fallback)
+        3. DexScreener (fallback, if available)
+        
+        The remaining requests are cancelled once one API returns a result.
         """
+        providers = [self._try_coingecko, self._try_oneinch]
+        if DEXSCREENER_AVAILABLE:
+            providers.append(self._try_dexscreener)
+        
+        async def delayed(rank: int, provider) -> Optional[Dict[str, Any]]:
+            if rank:
+                await asyncio.sleep(rank * self.PROVIDER_HEAD_START_SECONDS)
+            return await provider(token_symbol, blockchain)
+        
+        pending = {
+            asyncio.ensure_future(delayed(rank, provider))
+            for rank, provider in enumerate(providers)
+        }
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    # _try_* helpers log and swallow their own errors
+                    result = task.result()
+                    if result:
+                        return result
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def _try_coingecko(
+        self,
+        token_symbol: str,
+        blockchain: str
+    ) -> Optional[Dict[str, Any]]:
+        """Look the symbol up via CoinGecko search + contract endpoints"""
         start_time = time.time()
         
-        # Try CoinGecko first
         try:
             await self.rate_limiter.acquire('coingecko')
-            async with self.coingecko:
-                # First, search for coin ID
-                coin_id = await self.coingecko.search_coin(token_symbol)
-                if coin_id:
-                    contract_data = await self.coingecko.get_contract_address(coin_id, blockchain)
-                    if contract_data:
-                        response_time = int((time.time() - start_time) * 1000)
-                        self.cache.log_api_call(
-                            'coingecko',
-                            f'/coins/{coin_id}/contract/{blockchain}',
-                            True,
-                            response_time,
-                            200
-                        )
-                        return contract_data
+            # First, search for coin ID
+            coin_id = await self.coingecko.search_coin(token_symbol)
+            if coin_id:
+                contract_data = await self.coingecko.get_contract_address(coin_id, blockchain)
+                if contract_data:
+                    response_time = int((time.time() - start_time) * 1000)
+                    self.cache.log_api_call(
+                        'coingecko',
+                        f'/coins/{coin_id}/contract/{blockchain}',
+                        True,
+                        response_time,
+                        200
+                    )
+                    # Same shape as the other providers ('contract', not 'contract_address')
+                    return {
+                        'symbol': contract_data['symbol'] or token_symbol,
+                        'contract': contract_data['contract_address'],
+                        'blockchain': blockchain,
+                        'decimals': contract_data.get('decimals') or 18,
+                        'name': contract_data.get('name') or token_symbol,
+                        'verified': False,
+                        'source': 'coingecko'
+                    }
         except Exception as e:
-            logger.warning(f"CoinGecko API error: {e}")
+            logger.warning("CoinGecko API error: %s", e)
             response_time = int((time.time() - start_time) * 1000)
             self.cache.log_api_call(
                 'coingecko',
@@ -231,113 +443,145 @@ class ContractResolver:
                 str(e)
             )
         
-        # Try 1inch
+        return None
+    
+    async def _try_oneinch(
+        self,
+        token_symbol: str,
+        blockchain: str
+    ) -> Optional[Dict[str, Any]]:
+        """Look the symbol up via 1inch token search"""
+        start_time = time.time()
+        
         try:
             await self.rate_limiter.acquire('1inch')
-            async with self.oneinch:
-                tokens = await self.oneinch.search_tokens(token_symbol, blockchain, limit=1)
-                if tokens:
-                    token = tokens[0]  # Get first match
+            tokens = await self.oneinch.search_tokens(token_symbol, blockchain, limit=1)
+            if tokens:
+                token = tokens[0]  # Get first match
+                response_time = int((time.time() - start_time) * 1000)
+                self.cache.log_api_call(
+                    '1inch',
+                    f'/token/v1.2/{blockchain}/search',
+                    True,
+                    response_time,
+                    200
+                )
+                return {
+                    'symbol': token['symbol'],
+                    'contract': token['contract_address'],
+                    'blockchain': blockchain,
+                    'decimals': token.get('decimals', 18),
+                    'name': token.get('name', token_symbol),
+                    'verified': False,
+                    'source': '1inch'
+                }
+        except Exception as e:
+            logger.warning("1inch API error: %s", e)
+            response_time = int((time.time() - start_time) * 1000)
+            self.cache.log_api_call(
+                '1inch',
+                f'/token/v1.2/{blockchain}/search',
+                False,
+                response_time,
+                None,
+                str(e)
+            )
+        
+        return None
+    
+    async def _try_dexscreener(
+        self,
+        token_symbol: str,
+        blockchain: str
+    ) -> Optional[Dict[str, Any]]:
+        """Look the symbol up via DexScreener search"""
+        start_time = time.time()
+        
+        try:
+            await self.rate_limiter.acquire('dexscreener')
+            dexscreener = await _get_dexscreener()
+            # Search for token
+            tokens = await dexscreener.search_tokens(token_symbol)
+            # Filter by blockchain
+            for token in tokens:
+                if token['chain_id'].lower() == blockchain.lower():
                     response_time = int((time.time() - start_time) * 1000)
                     self.cache.log_api_call(
-                        '1inch',
-                        f'/token/v1.2/{blockchain}/search',
+                        'dexscreener',
+                        f'/search?q={token_symbol}',
                         True,
                         response_time,
                         200
                     )
                     return {
                         'symbol': token['symbol'],
-                        'contract': token['contract_address'],
+                        'contract': token['address'],
                         'blockchain': blockchain,
-                        'decimals': token.get('decimals', 18),
+                        'decimals': 18,  # DexScreener doesn't always provide this
                         'name': token.get('name', token_symbol),
                         'verified': False,
-                        'source': '1inch'
+                        'source': 'dexscreener'
                     }
         except Exception as e:
-            logger.warning(f"1inch API error: {e}")
+            logger.warning("DexScreener API error: %s", e)
             response_time = int((time.time() - start_time) * 1000)
             self.cache.log_api_call(
-                '1inch',
-                f'/token/v1.2/{blockchain}/search',
+                'dexscreener',
+                f'/search?q={token_symbol}',
                 False,
                 response_time,
                 None,
                 str(e)
             )
         
-        # Try DexScreener as fallback
-        if DEXSCREENER_AVAILABLE:
-            try:
-                await self.rate_limiter.acquire('dexscreener')
-                async with DexScreenerClient() as dexscreener:
-                    # Search for token
-                    tokens = await dexscreener.search_tokens(token_symbol)
-                    # Filter by blockchain
-                    for token in tokens:
-                        if token['chain_id'].lower() == blockchain.lower():
-                            response_time = int((time.time() - start_time) * 1000)
-                            self.cache.log_api_call(
-                                'dexscreener',
-                                f'/search?q={token_symbol}',
-                                True,
-                                response_time,
-                                200
-                            )
-                            return {
-                                'symbol': token['symbol'],
-                                'contract': token['address'],
-                                'blockchain': blockchain,
-                                'decimals': 18,  # DexScreener doesn't always provide this
-                                'name': token.get('name', token_symbol),
-                                'verified': False,
-                                'source': 'dexscreener'
-                            }
-            except Exception as e:
-                logger.warning(f"DexScreener API error: {e}")
-                response_time = int((time.time() - start_time) * 1000)
-                self.cache.log_api_call(
-                    'dexscreener',
-                    f'/search?q={token_symbol}',
-                    False,
-                    response_time,
-                    None,
-                    str(e)
-                )
-        
         return None
     
-    async def _log_failed_lookup(
+    async def _log_failed_lookups(
         self,
-        token_symbol: str,
+        token_symbols: List[str],
         blockchain: str,
         error_message: str
     ):
-        """Log failed lookup for analysis"""
+        """
+        Log failed lookups for analysis
+        
+        One INSERT ... ON CONFLICT DO UPDATE for all symbols: new failures
+        start at retry_count 1, known ones increment it. The symbols are
+        skipped for a while afterwards (see _recent_failures).
+        """
+        if not token_symbols:
+            return
+        
+        table = FailedContractLookup.__table__
+        stmt = upsert_insert(FailedContractLookup).values([
+            {
+                'token_symbol': symbol.upper(),
+                'blockchain': blockchain.lower(),
+                'error_message': error_message,
+                'retry_count': 1,
+                'failed_at': func.now()
+            }
+            for symbol in dict.fromkeys(symbol.upper() for symbol in token_symbols)
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['token_symbol', 'blockchain'],
+            set_={
+                'retry_count': func.coalesce(table.c.retry_count, 0) + 1,
+                'error_message': stmt.excluded.error_message,
+                'failed_at': func.now()
+            }
+        )
         try:
-            failed = self.db.query(FailedContractLookup).filter(
-                FailedContractLookup.token_symbol == token_symbol.upper(),
-                FailedContractLookup.blockchain == blockchain.lower()
-            ).first()
-            
-            if failed:
-                failed.retry_count += 1
-                failed.error_message = error_message
-                failed.failed_at = datetime.utcnow()
-            else:
-                failed = FailedContractLookup(
-                    token_symbol=token_symbol.upper(),
-                    blockchain=blockchain.lower(),
-                    error_message=error_message,
-                    retry_count=1
-                )
-                self.db.add(failed)
-            
-            self.db.commit()
+            result = await self.db.execute(stmt.returning(table.c.token_symbol, table.c.retry_count))
+            retry_counts = result.all()
+            await self.db.commit()
         except Exception as e:
-            logger.error(f"Error logging failed lookup: {e}")
-            self.db.rollback()
+            logger.error("Error logging failed lookup: %s", e)
+            await self.db.rollback()
+            retry_counts = [(symbol.upper(), 1) for symbol in token_symbols]
+        
+        for symbol, retry_count in retry_counts:
+            _recent_failures[(symbol, blockchain.lower())] = retry_count or 1
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get resolver metrics"""
@@ -362,56 +606,47 @@ class ContractResolver:
             Dictionary with API stats
         """
         try:
-            cutoff_time = datetime.utcnow() - timedelta(hours=hours)
+            cutoff_bucket = ApiCallLogHourly.bucket_for(datetime.utcnow() - timedelta(hours=hours))
             
-            # Get stats from API logs
-            logs = self.db.query(ApiCallLog).filter(
-                ApiCallLog.called_at >= cutoff_time
-            ).all()
+            # Read the hourly rollup (one row per API per hour) instead of raw logs
+            result = await self.db.execute(
+                select(
+                    ApiCallLogHourly.api_name,
+                    func.sum(ApiCallLogHourly.total),
+                    func.sum(ApiCallLogHourly.success),
+                    func.sum(ApiCallLogHourly.failure),
+                    func.sum(ApiCallLogHourly.sum_response_time_ms),
+                    func.sum(ApiCallLogHourly.response_count)
+                ).where(
+                    ApiCallLogHourly.hour_bucket >= cutoff_bucket
+                ).group_by(ApiCallLogHourly.api_name)
+            )
             
             stats = {
-                'total_calls': len(logs),
-                'successful_calls': sum(1 for log in logs if log.success),
-                'failed_calls': sum(1 for log in logs if not log.success),
+                'total_calls': 0,
+                'successful_calls': 0,
+                'failed_calls': 0,
                 'by_api': {},
                 'avg_response_time_ms': 0,
                 'cache_hit_rate': 0
             }
             
-            # Group by API
-            api_stats = {}
             total_response_time = 0
             response_count = 0
             
-            for log in logs:
-                api_name = log.api_name
-                if api_name not in api_stats:
-                    api_stats[api_name] = {
-                        'total': 0,
-                        'success': 0,
-                        'failed': 0,
-                        'avg_response_time_ms': 0
-                    }
-                
-                api_stats[api_name]['total'] += 1
-                if log.success:
-                    api_stats[api_name]['success'] += 1
-                else:
-                    api_stats[api_name]['failed'] += 1
-                
-                if log.response_time_ms:
-                    total_response_time += log.response_time_ms
-                    response_count += 1
-            
-            # Calculate averages
-            for api_name, api_data in api_stats.items():
-                api_logs = [log for log in logs if log.api_name == api_name and log.response_time_ms]
-                if api_logs:
-                    api_data['avg_response_time_ms'] = int(
-                        sum(log.response_time_ms for log in api_logs) / len(api_logs)
-                    )
+            for api_name, total, success, failure, sum_time, time_count in result.all():
+                stats['total_calls'] += total
+                stats['successful_calls'] += success
+                stats['failed_calls'] += failure
+                total_response_time += sum_time
+                response_count += time_count
+                stats['by_api'][api_name] = {
+                    'total': total,
+                    'success': success,
+                    'failed': failure,
+                    'avg_response_time_ms': int(sum_time / time_count) if time_count else 0
+                }
             
-            stats['by_api'] = api_stats
             if response_count > 0:
                 stats['avg_response_time_ms'] = int(total_response_time / response_count)
             
@@ -425,7 +660,7 @@ class ContractResolver:
             return stats
             
         except Exception as e:
-            logger.error(f"Error getting API stats: {e}")
+            logger.error("Error getting API stats: %s", e)
             return {
                 'total_calls': 0,
                 'successful_calls': 0,
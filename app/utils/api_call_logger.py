@@ -0,0 +1,147 @@
+"""
+Buffered writer for api_call_logs
+
+Rows are queued in memory and written by a background task with one
+multi-row Core INSERT per batch, bypassing the ORM unit of work. A batch is
+written once it holds MAX_BATCH_SIZE rows or FLUSH_INTERVAL_SECONDS after
+its first row, whichever comes first.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+from sqlalchemy import insert
+
+from app.database import async_engine, upsert_insert
+from app.models.api_call_log import ApiCallLog
+from app.models.api_call_log_hourly import ApiCallLogHourly
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL_SECONDS = 2.0
+MAX_BATCH_SIZE = 100
+
+# Queued by flush_api_call_logs() to write the current batch without waiting
+_FLUSH = object()
+
+_log_queue: Optional[asyncio.Queue] = None
+_drain_task: Optional[asyncio.Task] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def enqueue_api_call(row: Dict[str, Any]):
+    """
+    Queue an api_call_logs row; starts the drain task on first use per event loop
+    """
+    global _log_queue, _drain_task, _loop
+
+    loop = asyncio.get_running_loop()
+    if loop is not _loop:
+        _loop = loop
+        _log_queue = asyncio.Queue()
+        _drain_task = None
+    if _drain_task is None or _drain_task.done():
+        _drain_task = loop.create_task(_drain())
+
+    row.setdefault('called_at', datetime.utcnow())
+    _log_queue.put_nowait(row)
+
+
+async def _drain():
+    """Collect queued rows into batches and write them"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = []
+        item = await _log_queue.get()
+        received = 1
+        deadline = loop.time() + FLUSH_INTERVAL_SECONDS
+        while item is not _FLUSH:
+            batch.append(item)
+            timeout = deadline - loop.time()
+            if len(batch) >= MAX_BATCH_SIZE or timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(_log_queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            received += 1
+
+        if batch:
+            await _write_batch(batch)
+        for _ in range(received):
+            _log_queue.task_done()
+
+
+def _hourly_rollup(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Aggregate a batch into per-(api, hour) increments"""
+    buckets = defaultdict(lambda: {
+        'total': 0, 'success': 0, 'failure': 0,
+        'sum_response_time_ms': 0, 'response_count': 0
+    })
+    for row in batch:
+        bucket = buckets[(row['api_name'], ApiCallLogHourly.bucket_for(row['called_at']))]
+        bucket['total'] += 1
+        if row['success']:
+            bucket['success'] += 1
+        else:
+            bucket['failure'] += 1
+        if row.get('response_time_ms') is not None:
+            bucket['sum_response_time_ms'] += row['response_time_ms']
+            bucket['response_count'] += 1
+
+    return [
+        {'api_name': api_name, 'hour_bucket': hour_bucket, **counts}
+        for (api_name, hour_bucket), counts in buckets.items()
+    ]
+
+
+async def _write_batch(batch: List[Dict[str, Any]]):
+    """Write raw rows and their hourly rollup in one transaction"""
+    hourly = ApiCallLogHourly.__table__
+    upsert = upsert_insert(hourly).values(_hourly_rollup(batch))
+    upsert = upsert.on_conflict_do_update(
+        index_elements=['api_name', 'hour_bucket'],
+        set_={
+            column: hourly.c[column] + upsert.excluded[column]
+            for column in ('total', 'success', 'failure', 'sum_response_time_ms', 'response_count')
+        }
+    )
+
+    try:
+        async with async_engine.begin() as conn:
+            await conn.execute(insert(ApiCallLog), batch)
+            await conn.execute(upsert)
+    except Exception as e:
+        logger.error("Error writing %d API call logs: %s", len(batch), e)
+
+
+async def flush_api_call_logs():
+    """
+    Wait until every queued row is written, then stop the drain task (call on shutdown)
+    """
+    global _drain_task
+
+    if _log_queue is None or _loop is not asyncio.get_running_loop():
+        return
+
+    if _drain_task is not None and not _drain_task.done():
+        # Cut the current batch short instead of waiting out the interval
+        _log_queue.put_nowait(_FLUSH)
+        await _log_queue.join()
+        # Idle at queue.get() now, safe to cancel
+        _drain_task.cancel()
+        try:
+            await _drain_task
+        except asyncio.CancelledError:
+            pass
+    _drain_task = None
+
+    batch = []
+    while not _log_queue.empty():
+        item = _log_queue.get_nowait()
+        if item is not _FLUSH:
+            batch.append(item)
+    if batch:
+        await _write_batch(batch)
@@ -2,51 +2,217 @@
 Caching utilities for contract addresses
 """
 import time
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from app.models.contract_address import ContractAddress
-from app.models.api_call_log import ApiCallLog
+from typing import Optional, Dict, Any, List
+from datetime import datetime
+from cachetools import TLRUCache
+from sqlalchemy import select, func, case, literal, bindparam, DateTime
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import upsert_insert, add_seconds
+from app.models.contract_address import ContractAddress, MIN_TTL_SECONDS, MAX_TTL_SECONDS
+from app.utils.api_call_logger import enqueue_api_call
+
+# In-process L1 in front of the database for the hot tokens:
+# (symbol, blockchain) -> (row, monotonic expiry). An entry expires when the
+# database row it came from does, and is dropped when that contract is saved.
+_l1 = TLRUCache(maxsize=4096, ttu=lambda _key, value, _now: value[1])
+
+# Cache reads, built once at import so a lookup only binds parameters (the
+# compiled SQL comes from the engine's statement cache). Unexpired rows, most
+# recently verified first; 'now' is the cache_valid_clause() reference time
+_CACHED_COLUMNS = (
+    ContractAddress.token_symbol,
+    ContractAddress.token_name,
+    ContractAddress.contract_address,
+    ContractAddress.blockchain,
+    ContractAddress.decimals,
+    ContractAddress.verified,
+    ContractAddress.last_verified_at,
+    ContractAddress.expires_at
+)
+_CACHED_CONTRACT_STMT = select(*_CACHED_COLUMNS).where(
+    ContractAddress.token_symbol == bindparam('symbol'),
+    ContractAddress.blockchain == bindparam('blockchain'),
+    ContractAddress.cache_valid_clause(bindparam('now'))
+).order_by(ContractAddress.last_verified_at.desc()).limit(1)
+_CACHED_CONTRACTS_BULK_STMT = select(*_CACHED_COLUMNS).where(
+    ContractAddress.token_symbol.in_(bindparam('symbols', expanding=True)),
+    ContractAddress.blockchain == bindparam('blockchain'),
+    ContractAddress.cache_valid_clause(bindparam('now'))
+).order_by(ContractAddress.last_verified_at.desc())
 
 
 class ContractCache:
     """
     Database-backed cache for contract addresses
     """
-    def __init__(self, db_session: Session, cache_ttl_seconds: int = 86400):
+    # Bumped on every committed write so in-process reply caches can invalidate
+    version = 0
+    
+    def __init__(self, db_session: AsyncSession, cache_ttl_seconds: int = 86400):
         self.db = db_session
         self.cache_ttl = cache_ttl_seconds
     
-    def get_cached_contract(
+    async def get_cached_contract(
         self, 
         token_symbol: str, 
         blockchain: str
-    ) -> Optional[ContractAddress]:
+    ) -> Optional[Row]:
         """
         Get cached contract address if valid
         
+        Read-only path: returns a Core row of the columns callers need
+        (named like the model attributes) instead of an ORM instance.
+        Hot entries are served from the in-process L1 without a query.
+        
         Args:
             token_symbol: Token symbol
             blockchain: Blockchain name
             
         Returns:
-            ContractAddress if found and valid, None otherwise
+            Row with token_symbol, token_name, contract_address, blockchain,
+            decimals, verified, last_verified_at and expires_at if found
+            and valid, None otherwise
         """
+        symbol = token_symbol.upper()
+        chain = blockchain.lower()
+        entry = _l1.get((symbol, chain))
+        if entry is not None:
+            return entry[0]
+        
+        now = datetime.utcnow()
+        
         try:
-            contract = self.db.query(ContractAddress).filter(
-                ContractAddress.token_symbol == token_symbol.upper(),
-                ContractAddress.blockchain == blockchain.lower()
-            ).first()
-            
-            if contract and contract.is_cache_valid(self.cache_ttl):
-                return contract
-            
-            return None
+            # Expired rows are filtered by the database, not in Python
+            result = await self.db.execute(
+                _CACHED_CONTRACT_STMT,
+                {'symbol': symbol, 'blockchain': chain, 'now': now}
+            )
+            row = result.first()
+            if row is not None:
+                self._remember(row, now)
+            return row
         except Exception as e:
             print(f"Error getting cached contract: {e}")
             return None
     
-    def save_contract(
+    async def get_cached_contracts_bulk(
+        self,
+        token_symbols: List[str],
+        blockchain: str
+    ) -> Dict[str, Row]:
+        """
+        Get valid cached contracts for several symbols in one query
+        
+        Args:
+            token_symbols: Token symbols
+            blockchain: Blockchain name
+            
+        Returns:
+            Mapping of uppercase symbol to row (same columns as
+            get_cached_contract); symbols without a valid entry are absent
+        """
+        chain = blockchain.lower()
+        cached = {}
+        symbols = set()
+        for symbol in token_symbols:
+            symbol = symbol.upper()
+            entry = _l1.get((symbol, chain))
+            if entry is not None:
+                cached[symbol] = entry[0]
+            else:
+                symbols.add(symbol)
+        if not symbols:
+            return cached
+        now = datetime.utcnow()
+        
+        try:
+            result = await self.db.execute(
+                _CACHED_CONTRACTS_BULK_STMT,
+                {'symbols': list(symbols), 'blockchain': chain, 'now': now}
+            )
+            # Most recently verified row per symbol, like get_cached_contract
+            for row in result.all():
+                if row.token_symbol not in cached:
+                    cached[row.token_symbol] = row
+                    self._remember(row, now)
+            return cached
+        except Exception as e:
+            print(f"Error getting cached contracts: {e}")
+            return cached
+    
+    @staticmethod
+    def _remember(row: Row, now: datetime):
+        """Put a valid row into the L1 until its expires_at"""
+        remaining = (row.expires_at - now).total_seconds()
+        _l1[(row.token_symbol, row.blockchain)] = (row, time.monotonic() + remaining)
+    
+    def _upsert(self, contracts_data: List[Dict[str, Any]]):
+        """
+        One INSERT ... ON CONFLICT DO UPDATE for the given contracts
+        
+        Conflicts on (token_symbol, blockchain, contract_address) refresh
+        last_verified_at and verified; name and decimals are only replaced
+        by non-null values. Later duplicates in the list win.
+        
+        The row's TTL adapts to how stable the answer is: re-verifying the
+        same address doubles it (up to MAX_TTL_SECONDS), while a new address
+        for a known symbol starts at half the previous address's TTL (at
+        least MIN_TTL_SECONDS). expires_at is written alongside it.
+        """
+        table = ContractAddress.__table__
+        now = datetime.utcnow()
+        rows = {}
+        for data in contracts_data:
+            new_ttl = self._new_address_ttl(table, data)
+            row = {
+                'token_symbol': data['symbol'].upper(),
+                'token_name': data.get('name'),
+                'contract_address': data['contract'].lower(),
+                'blockchain': data['blockchain'].lower(),
+                'decimals': data.get('decimals'),
+                'verified': data.get('verified', False),
+                'last_verified_at': now,
+                'suggested_ttl_seconds': new_ttl,
+                'last_ttl_updated_at': now,
+                'expires_at': add_seconds(literal(now, DateTime), new_ttl)
+            }
+            # A row may only be upserted once per statement
+            rows[(row['token_symbol'], row['blockchain'], row['contract_address'])] = row
+        
+        stmt = upsert_insert(ContractAddress).values(list(rows.values()))
+        doubled = func.coalesce(table.c.suggested_ttl_seconds, self.cache_ttl) * 2
+        ttl = case((doubled > MAX_TTL_SECONDS, MAX_TTL_SECONDS), else_=doubled)
+        return stmt.on_conflict_do_update(
+            index_elements=['token_symbol', 'blockchain', 'contract_address'],
+            set_={
+                'token_name': func.coalesce(stmt.excluded.token_name, table.c.token_name),
+                'decimals': func.coalesce(stmt.excluded.decimals, table.c.decimals),
+                'verified': stmt.excluded.verified,
+                'last_verified_at': stmt.excluded.last_verified_at,
+                'suggested_ttl_seconds': ttl,
+                'last_ttl_updated_at': stmt.excluded.last_ttl_updated_at,
+                'expires_at': add_seconds(stmt.excluded.last_verified_at, ttl),
+                'updated_at': func.now()
+            }
+        ), rows.keys()
+    
+    def _new_address_ttl(self, table, data: Dict[str, Any]):
+        """
+        TTL for a newly inserted address: half the shortest TTL of the
+        symbol's other addresses on the chain, the default TTL if none
+        """
+        halved = func.min(func.coalesce(table.c.suggested_ttl_seconds, self.cache_ttl)) // 2
+        return select(func.coalesce(
+            case((halved < MIN_TTL_SECONDS, MIN_TTL_SECONDS), else_=halved),
+            self.cache_ttl
+        )).where(
+            table.c.token_symbol == data['symbol'].upper(),
+            table.c.blockchain == data['blockchain'].lower(),
+            table.c.contract_address != data['contract'].lower()
+        ).scalar_subquery()
+    
+    async def save_contract(
         self, 
         contract_data: Dict[str, Any]
     ) -> ContractAddress:
@@ -60,40 +226,54 @@ class ContractCache:
             ContractAddress instance
         """
         try:
-            # Check if exists
-            contract = self.db.query(ContractAddress).filter(
-                ContractAddress.token_symbol == contract_data['symbol'].upper(),
-                ContractAddress.blockchain == contract_data['blockchain'].lower(),
-                ContractAddress.contract_address == contract_data['contract'].lower()
-            ).first()
-            
-            if contract:
-                # Update existing
-                contract.token_name = contract_data.get('name', contract.token_name)
-                contract.decimals = contract_data.get('decimals', contract.decimals)
-                contract.verified = contract_data.get('verified', contract.verified)
-                contract.last_verified_at = datetime.utcnow()
-            else:
-                # Create new
-                contract = ContractAddress(
-                    token_symbol=contract_data['symbol'].upper(),
-                    token_name=contract_data.get('name'),
-                    contract_address=contract_data['contract'].lower(),
-                    blockchain=contract_data['blockchain'].lower(),
-                    decimals=contract_data.get('decimals'),
-                    verified=contract_data.get('verified', False),
-                    last_verified_at=datetime.utcnow()
-                )
-                self.db.add(contract)
+            stmt, keys = self._upsert([contract_data])
+            result = await self.db.scalars(
+                stmt.returning(ContractAddress),
+                execution_options={'populate_existing': True}
+            )
+            contract = result.one()
             
-            self.db.commit()
+            await self.db.commit()
+            ContractCache.version += 1
+            for key in keys:
+                _l1.pop(key[:2], None)
             return contract
             
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             print(f"Error saving contract: {e}")
             raise
     
+    async def save_contracts(
+        self,
+        contracts_data: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Save or update several contract addresses with one statement and one commit
+        
+        Args:
+            contracts_data: Dictionaries like save_contract's argument
+            
+        Returns:
+            Number of contracts saved
+        """
+        if not contracts_data:
+            return 0
+        
+        try:
+            stmt, keys = self._upsert(contracts_data)
+            await self.db.execute(stmt)
+            await self.db.commit()
+            ContractCache.version += 1
+            for key in keys:
+                _l1.pop(key[:2], None)
+            return len(keys)
+            
+        except Exception as e:
+            await self.db.rollback()
+            print(f"Error saving contracts: {e}")
+            raise
+    
     def log_api_call(
         self,
         api_name: str,
@@ -106,6 +286,9 @@ class ContractCache:
         """
         Log API call for metrics tracking
         
+        The row is queued and written in batches by app.utils.api_call_logger,
+        so this never waits on the database.
+        
         Args:
             api_name: Name of the API
             endpoint: API endpoint called
@@ -114,18 +297,11 @@ class ContractCache:
             status_code: HTTP status code
             error_message: Error message if failed
         """
-        try:
-            log_entry = ApiCallLog(
-                api_name=api_name,
-                endpoint=endpoint,
-                status_code=status_code,
-                success=success,
-                response_time_ms=response_time_ms,
-                error_message=error_message
-            )
-            self.db.add(log_entry)
-            self.db.commit()
-        except Exception as e:
-            self.db.rollback()
-            print(f"Error logging API call: {e}")
-
+        enqueue_api_call({
+            'api_name': api_name,
+            'endpoint': endpoint,
+            'status_code': status_code,
+            'success': success,
+            'response_time_ms': response_time_ms,
+            'error_message': error_message
+        })
@@ -0,0 +1,166 @@
+"""
+Daily range partitions for api_call_logs (PostgreSQL only)
+
+api_call_logs is PARTITION BY RANGE (called_at) with one child table per
+day plus a DEFAULT partition. Time-window queries touch only the newest
+partitions, and expired days are detached and dropped in O(1) instead of
+DELETEd row by row. Long-term history lives in api_call_log_hourly.
+"""
+import os
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import MetaData, PrimaryKeyConstraint, Table, text
+from sqlalchemy.engine import Connection
+
+from app.database import async_engine
+from app.models.api_call_log import ApiCallLog
+
+logger = logging.getLogger(__name__)
+
+TABLE = ApiCallLog.__tablename__
+DEFAULT_PARTITION = f'{TABLE}_default'
+RETENTION_DAYS = int(os.getenv('API_CALL_LOG_RETENTION_DAYS', '30'))
+DAYS_AHEAD = 2
+MAINTENANCE_INTERVAL_SECONDS = 6 * 3600
+
+
+def partition_name(day: date) -> str:
+    """Child table name for one day, e.g. api_call_logs_20250131"""
+    return f'{TABLE}_{day:%Y%m%d}'
+
+
+def _table_kind(conn: Connection) -> Optional[str]:
+    """pg_class.relkind of api_call_logs: 'p' partitioned, 'r' plain, None if missing"""
+    return conn.execute(
+        text("SELECT relkind FROM pg_class WHERE relname = :name AND relkind IN ('r', 'p')"),
+        {'name': TABLE}
+    ).scalar()
+
+
+def partitioned_table() -> Table:
+    """
+    api_call_logs as created on PostgreSQL: the model's table, partitioned
+    by range of called_at
+
+    PostgreSQL requires the partition column in every unique constraint, so
+    the key is (id, called_at) rather than the model's id alone (which keeps
+    the model usable with create_all on SQLite).
+    """
+    table = ApiCallLog.__table__.to_metadata(MetaData())
+    table.c.called_at.primary_key = True
+    table.append_constraint(PrimaryKeyConstraint('id', 'called_at', name=f'{TABLE}_pkey'))
+    table.dialect_kwargs['postgresql_partition_by'] = 'RANGE (called_at)'
+    return table
+
+
+def create_partitioned_table(conn: Connection):
+    """Create api_call_logs with its DEFAULT partition and upcoming day partitions"""
+    partitioned_table().create(conn)
+    ensure_partitions(conn)
+
+
+def create_day_partition(conn: Connection, day: date):
+    """
+    Create the partition for one day if it does not exist yet
+
+    Fails (logged, not raised) if the DEFAULT partition already holds rows
+    for that day; those rows then simply stay in DEFAULT.
+    """
+    try:
+        with conn.begin_nested():
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {partition_name(day)} PARTITION OF {TABLE} "
+                f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+            ))
+    except Exception as e:
+        logger.warning("Could not create partition %s: %s", partition_name(day), e)
+
+
+def convert_to_partitioned(conn: Connection):
+    """
+    One-time conversion of a plain api_call_logs table into the partitioned layout
+
+    The old table is renamed, its rows are copied into the new partitions
+    and it is dropped. Run inside a transaction.
+    """
+    legacy = f'{TABLE}_legacy'
+
+    conn.execute(text(f"ALTER TABLE {TABLE} RENAME TO {legacy}"))
+    conn.execute(text(f"ALTER TABLE {legacy} RENAME CONSTRAINT {TABLE}_pkey TO {legacy}_pkey"))
+    conn.execute(text(f"ALTER SEQUENCE IF EXISTS {TABLE}_id_seq RENAME TO {legacy}_id_seq"))
+    # Index names are schema-wide; free them for the new table
+    for (index_name,) in conn.execute(
+        text("SELECT indexname FROM pg_indexes WHERE tablename = :name AND indexname <> :pkey"),
+        {'name': legacy, 'pkey': f'{legacy}_pkey'}
+    ).all():
+        conn.execute(text(f'DROP INDEX IF EXISTS "{index_name}"'))
+
+    create_partitioned_table(conn)
+
+    columns = ', '.join(column.name for column in ApiCallLog.__table__.columns)
+    conn.execute(text(f"INSERT INTO {TABLE} ({columns}) SELECT {columns} FROM {legacy}"))
+    conn.execute(text(
+        f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), "
+        f"COALESCE((SELECT MAX(id) FROM {TABLE}), 0) + 1, false)"
+    ))
+    conn.execute(text(f"DROP TABLE {legacy}"))
+    logger.info("Converted %s to daily range partitions", TABLE)
+
+
+def ensure_partitions(conn: Connection, today: Optional[date] = None):
+    """
+    Create the DEFAULT partition and partitions for today and the next
+    DAYS_AHEAD days, then detach and drop partitions older than RETENTION_DAYS
+    """
+    today = today or datetime.utcnow().date()
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT"))
+    for offset in range(DAYS_AHEAD + 1):
+        create_day_partition(conn, today + timedelta(days=offset))
+
+    cutoff = partition_name(today - timedelta(days=RETENTION_DAYS))
+    children = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :name"
+    ), {'name': TABLE}).scalars().all()
+
+    # Names sort chronologically (YYYYMMDD suffix); the default partition is kept
+    for child in sorted(children):
+        if child == DEFAULT_PARTITION or child >= cutoff:
+            continue
+        conn.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {child}"))
+        conn.execute(text(f"DROP TABLE {child}"))
+        logger.info("Dropped expired partition %s", child)
+
+
+def maintain_partitions(conn: Connection):
+    """
+    Bring api_call_logs partitions up to date (no-op on non-PostgreSQL databases)
+    """
+    if conn.dialect.name != 'postgresql':
+        return
+
+    table_kind = _table_kind(conn)
+    if table_kind is None:
+        create_partitioned_table(conn)
+    elif table_kind == 'r':
+        convert_to_partitioned(conn)
+    else:
+        ensure_partitions(conn)
+
+
+async def run_partition_maintenance(interval_seconds: int = MAINTENANCE_INTERVAL_SECONDS):
+    """
+    Keep partitions current from a long-running process (cancel the task to stop)
+    """
+    while True:
+        try:
+            async with async_engine.begin() as conn:
+                await conn.run_sync(maintain_partitions)
+        except Exception as e:
+            logger.error("api_call_logs partition maintenance failed: %s", e)
+        await asyncio.sleep(interval_seconds)
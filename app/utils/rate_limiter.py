@@ -4,43 +4,55 @@ Rate limiter for API calls
 import asyncio
 import time
 from typing import Dict
-from collections import defaultdict
 
 
 class TokenBucketRateLimiter:
     """
     Token bucket rate limiter for API calls
+
+    Implemented as virtual scheduling: each acquire() claims the next free
+    send slot and sleeps until it without holding a lock, so concurrent
+    callers wait in parallel instead of queueing behind one sleeper.
     """
-    def __init__(self, requests_per_minute: int = 10):
-        self.capacity = requests_per_minute
-        self.tokens = requests_per_minute
-        self.last_update = time.time()
-        self.lock = asyncio.Lock()
+    __slots__ = ('rate', 'capacity', '_interval', '_burst_window', '_next_available')
+    
+    def __init__(self, requests_per_minute: int = 10, burst: int = None):
+        self.rate = requests_per_minute
+        # Bucket size; defaults to a full minute's worth of requests
+        self.capacity = burst or requests_per_minute
+        self._interval = 60.0 / requests_per_minute
+        # A full bucket lets this many slots be claimed ahead of time
+        self._burst_window = (self.capacity - 1) * self._interval
+        # Theoretical time of the next slot when the bucket is drained
+        self._next_available = time.monotonic()
     
     async def acquire(self):
         """Wait if necessary and consume one token"""
-        async with self.lock:
-            now = time.time()
-            elapsed = now - self.last_update
-            
-            # Refill tokens based on time passed
-            refill = elapsed * (self.capacity / 60)
-            self.tokens = min(self.capacity, self.tokens + refill)
-            self.last_update = now
-            
-            if self.tokens < 1:
-                # Calculate wait time
-                wait_time = (1 - self.tokens) * 60 / self.capacity
-                await asyncio.sleep(wait_time)
-                self.tokens = 0
-            else:
-                self.tokens -= 1
+        # No await between reading and claiming the slot, so no lock is needed
+        now = time.monotonic()
+        slot = max(now, self._next_available)
+        self._next_available = slot + self._interval
+        wait_time = slot - self._burst_window - now
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+    
+    def throttle(self, seconds: float):
+        """
+        Back off after the server signalled a rate limit (HTTP 429):
+        callers get no tokens for the next `seconds`
+        """
+        self._next_available = max(
+            self._next_available,
+            time.monotonic() + seconds + self._burst_window
+        )
 
 
 class RateLimiterManager:
     """
     Manages rate limiters for multiple APIs
     """
+    __slots__ = ('limiters', 'default_rpm')
+    
     def __init__(self):
         self.limiters: Dict[str, TokenBucketRateLimiter] = {}
         self.default_rpm = 10
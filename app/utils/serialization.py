@@ -0,0 +1,10 @@
+"""
+Serialization helpers shared by model to_dict() methods
+"""
+from datetime import datetime
+from typing import Optional
+
+
+def isoformat_or_none(value: Optional[datetime]) -> Optional[str]:
+    """Return ISO-8601 string for a datetime, or None"""
+    return value.isoformat() if value is not None else None
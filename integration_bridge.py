@@ -37,6 +37,7 @@ class PythonIntegrationBridge:
         """Initialize the Python components"""
         if not self.is_initialized:
             await self.dex_client.__aenter__()
+            await self.token_registry.warm_cache()
             self.is_initialized = True
             logger.info("Python integration bridge initialized")
     
@@ -62,7 +63,8 @@ class PythonIntegrationBridge:
                     'dex_id': price.dex_id,
                     'unique_key': price.unique_key,
                     'is_liquid': price.is_liquid,
-                    'age_seconds': price.age_seconds
+                    'age_seconds': price.age_seconds,
+                    'is_stale': price.is_stale
                 }
             return None
         except Exception as e:
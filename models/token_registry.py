@@ -1,17 +1,29 @@
 import asyncio
+import bisect
+import sys
 import time
-from typing import Dict, List, Optional, Set, TYPE_CHECKING
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple, Union, TYPE_CHECKING
 from dataclasses import dataclass
 import logging
 
+from utils.dexscreener import DEXSCREENER_CHAINS
+from utils.token_cache import TokenDiskCache, DEFAULT_CACHE_PATH
+
 if TYPE_CHECKING:
     from utils.dexscreener import TokenPrice
 
 
 logger = logging.getLogger(__name__)
 
+# Tokens share one string object per chain instead of a copy each
+_CHAIN_INTERN = {chain: sys.intern(chain) for chain in DEXSCREENER_CHAINS}
+
+# (chain, address), both lowercase
+TokenKey = Tuple[str, str]
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VerifiedToken:
     """Token with verification status"""
     chain_id: str
@@ -19,21 +31,30 @@ class VerifiedToken:
     symbol: str
     name: str
     decimals: int
-    liquidity_usd: float
+    liquidity_usd: Optional[float]  # None for whitelisted tokens (not fetched)
     holder_count: int
     is_verified: bool
     is_scam: bool
-    scam_reason: Optional[str]
-    unique_key: str  # "chain:address"
+    scam_indicators: Optional[Tuple[str, ...]]  # Failed verification checks
     added_timestamp: float
     
+    @property
+    def unique_key(self) -> str:
+        """"chain:address" (derived rather than stored per token)"""
+        return f"{self.chain_id}:{self.address}"
+    
+    @property
+    def scam_reason(self) -> Optional[str]:
+        """Failed verification checks as one message (joined on demand)"""
+        return ', '.join(self.scam_indicators) if self.scam_indicators else None
+    
     @property
     def is_tradeable(self) -> bool:
         """Check if token is safe to trade"""
         return (
             self.is_verified and 
             not self.is_scam and 
-            self.liquidity_usd >= 100_000
+            (self.liquidity_usd is None or self.liquidity_usd >= 100_000)
         )
 
 
@@ -48,31 +69,70 @@ class TokenRegistry:
     - Track scam tokens to warn users
     """
     
-    def __init__(self, dex_client):
+    def __init__(self, dex_client, cache_path: Optional[str] = DEFAULT_CACHE_PATH):
         self.dex_client = dex_client
         
-        # Primary index: chain:address -> token data
-        self.tokens_by_key: Dict[str, VerifiedToken] = {}
+        # Verified tokens persisted across restarts (None, the default
+        # unless TOKEN_CACHE_PATH is set, disables)
+        self.disk_cache = TokenDiskCache(cache_path) if cache_path else None
+        
+        # Primary index: (chain, address) -> token data
+        self.tokens_by_key: Dict[TokenKey, VerifiedToken] = {}
         
-        # Secondary index: chain:symbol -> [addresses]
+        # Secondary index: chain:symbol -> [addresses], highest liquidity first
         # Multiple tokens can have same symbol!
-        self.addresses_by_symbol: Dict[str, List[str]] = {}
+        self.addresses_by_symbol: Dict[str, List[str]] = defaultdict(list)
+        # Parallel to addresses_by_symbol: -liquidity_usd (-inf if whitelisted), ascending (for bisect)
+        self._symbol_sort_keys: Dict[str, List[float]] = defaultdict(list)
         
         # Scam registry
-        self.scam_tokens: Set[str] = set()
+        self.scam_tokens: Set[TokenKey] = set()
+        
+        # Keys being fetched, with the _load_tokens task fetching them:
+        # concurrent adds of the same token wait for one fetch
+        self._inflight: Dict[TokenKey, asyncio.Task] = {}
         
-        # Known legitimate tokens (manually curated)
+        # Known legitimate tokens (manually curated): symbol, name, decimals
         self.whitelist = {
-            "ethereum:0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48": "USDC",
-            "ethereum:0xdac17f958d2ee523a2206206994597c13d831ec7": "USDT",
-            "ethereum:0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2": "WETH",
-            "bsc:0x55d398326f99059ff775485246999027b3197955": "USDT",
-            "bsc:0x8ac76a51cc950d9822d68b83fe1ad97b32cd580d": "USDC",
+            ("ethereum", "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"): ("USDC", "USD Coin", 6),
+            ("ethereum", "0xdac17f958d2ee523a2206206994597c13d831ec7"): ("USDT", "Tether USD", 6),
+            ("ethereum", "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2"): ("WETH", "Wrapped Ether", 18),
+            ("bsc", "0x55d398326f99059ff775485246999027b3197955"): ("USDT", "Tether USD", 18),
+            ("bsc", "0x8ac76a51cc950d9822d68b83fe1ad97b32cd580d"): ("USDC", "USD Coin", 18),
         }
+        self._warmed = False
+    
+    @staticmethod
+    def _intern_chain(chain_id: str) -> str:
+        """Lowercase chain_id, as the shared string for known chains"""
+        chain_id = chain_id.lower()
+        return _CHAIN_INTERN.get(chain_id, chain_id)
+    
+    async def warm_cache(self) -> None:
+        """
+        Register every whitelisted token up front, one add_tokens call per
+        chain run concurrently, so first lookups don't pay for it
+        """
+        if self._warmed:
+            return
+        self._warmed = True
+        
+        addresses_by_chain: Dict[str, List[str]] = {}
+        for chain_id, address in self.whitelist:
+            addresses_by_chain.setdefault(chain_id, []).append(address)
+        await asyncio.gather(*(
+            self.add_tokens(chain_id, addresses, verify=False)
+            for chain_id, addresses in addresses_by_chain.items()
+        ))
     
-    def make_key(self, chain_id: str, address: str) -> str:
+    def make_key(self, chain_id: str, address: str) -> TokenKey:
         """Create unique identifier"""
-        return f"{chain_id.lower()}:{address.lower()}"
+        return (chain_id.lower(), address.lower())
+    
+    @staticmethod
+    def _fmt_key(key: TokenKey) -> str:
+        """"chain:address" form of a key, for messages and the disk cache"""
+        return f"{key[0]}:{key[1]}"
     
     async def add_token(
         self, 
@@ -94,69 +154,261 @@ class TokenRegistry:
         Raises:
             ScamTokenError if token fails verification
         """
-        key = self.make_key(chain_id, address)
+        result = (await self.add_tokens(chain_id, [address], verify))[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+    
+    async def add_tokens(
+        self,
+        chain_id: str,
+        addresses: List[str],
+        verify: bool = True
+    ) -> List[Union[VerifiedToken, Exception]]:
+        """
+        Add several tokens on one chain to the registry with verification
         
-        # Check if already registered
+        Token data for all new addresses comes from one batched DexScreener
+        lookup instead of one request per token.
+        
+        Args:
+            chain_id: Normalized chain identifier
+            addresses: Contract addresses
+            verify: Whether to verify legitimacy
+            
+        Returns:
+            One entry per address, in order: the VerifiedToken, or the
+            ScamTokenError/NoDataError add_token would have raised
+        """
+        results: List[Union[VerifiedToken, Exception, None]] = []
+        # Keys being loaded, by this call or a concurrent one, and their loading task
+        pending: Dict[TokenKey, Optional[asyncio.Task]] = {}
+        owned: List[TokenKey] = []
+        to_load = []
+        for address in addresses:
+            key = self.make_key(chain_id, address)
+            
+            # Check if already registered
+            if key in self.tokens_by_key:
+                results.append(self.tokens_by_key[key])
+            # Check scam list
+            elif key in self.scam_tokens:
+                results.append(ScamTokenError(f"Token {self._fmt_key(key)} is marked as scam"))
+            else:
+                results.append(None)
+                if key in pending:
+                    continue
+                if key in self._inflight:
+                    # Another call is already fetching it: wait for its result
+                    pending[key] = self._inflight[key]
+                else:
+                    pending[key] = None  # Set to this call's task below
+                    owned.append(key)
+                    to_load.append(address)
+        
+        if to_load:
+            # Its own task, awaited shielded by every caller: cancelling any
+            # of them (even this one) doesn't cancel the load for the others
+            load = asyncio.ensure_future(self._load_tokens(chain_id, to_load, verify))
+            for key in owned:
+                pending[key] = self._inflight[key] = load
+            
+            def release(_):
+                for key in owned:
+                    self._inflight.pop(key, None)
+            load.add_done_callback(release)
+        
+        for index, address in enumerate(addresses):
+            if results[index] is None:
+                key = self.make_key(chain_id, address)
+                results[index] = (await asyncio.shield(pending[key]))[key]
+        return results
+    
+    async def _load_tokens(
+        self,
+        chain_id: str,
+        addresses: List[str],
+        verify: bool
+    ) -> Dict[TokenKey, Union[VerifiedToken, Exception]]:
+        """
+        Load unregistered tokens from the disk cache or DexScreener (see add_tokens)
+        
+        Returns:
+            Mapping of key to token or exception
+        """
+        loaded: Dict[TokenKey, Union[VerifiedToken, Exception]] = {}
+        
+        # Whitelisted tokens are built locally, without a DexScreener request
+        for address in addresses:
+            key = self.make_key(chain_id, address)
+            if key in self.whitelist:
+                loaded[key] = self._whitelisted_token(key)
+        if loaded:
+            addresses = [address for address in addresses if self.make_key(chain_id, address) not in loaded]
+        
+        # Tokens verified by an earlier run: used as-is while their price is
+        # fresh, otherwise their metadata is kept and only the price refetched
+        repricing = {}
+        if self.disk_cache:
+            keys = [self.make_key(chain_id, address) for address in addresses]
+            cached = await self.disk_cache.run(self.disk_cache.get_many, [self._fmt_key(key) for key in keys])
+            for key in keys:
+                row = cached.get(self._fmt_key(key))
+                if row is None:
+                    continue
+                if self.disk_cache.has_fresh_price(row):
+                    loaded[key] = self._restore(key, row)
+                else:
+                    repricing[key] = row
+            addresses = [address for address, key in zip(addresses, keys) if key not in loaded]
+        
+        if not addresses:
+            return loaded
+        
+        # Fetch token data from DexScreener
+        prices = await self.dex_client.get_token_prices_bulk(chain_id, addresses)
+        
+        fetched = []
+        repriced = []
+        for address in addresses:
+            key = self.make_key(chain_id, address)
+            price = prices.get(address.lower())
+            row = repricing.get(key)
+            if row is not None and price:
+                # Cached metadata and verification, fresh liquidity
+                token = self._restore(key, row, price.liquidity_usd)
+                repriced.append(token)
+            else:
+                token = await self._register(chain_id, address, price, verify)
+                if isinstance(token, VerifiedToken):
+                    fetched.append(token)
+            loaded[key] = token
+        
+        if self.disk_cache:
+            await self.disk_cache.run(self.disk_cache.put_many, fetched)
+            await self.disk_cache.run(self.disk_cache.update_prices, repriced)
+        return loaded
+    
+    def _whitelisted_token(self, key: TokenKey) -> VerifiedToken:
+        """Index a whitelisted token from the bundled metadata (see add_tokens)"""
+        symbol, name, decimals = self.whitelist[key]
+        token = VerifiedToken(
+            chain_id=self._intern_chain(key[0]),
+            address=key[1],
+            symbol=sys.intern(symbol),
+            name=name,
+            decimals=decimals,
+            liquidity_usd=None,  # Not fetched; _index ranks it first
+            holder_count=0,
+            is_verified=True,
+            is_scam=False,
+            scam_indicators=None,
+            added_timestamp=time.time()
+        )
+        self._index(token)
+        return token
+    
+    def _restore(
+        self,
+        key: TokenKey,
+        row,
+        liquidity_usd: Optional[float] = None
+    ) -> Union[VerifiedToken, Exception]:
+        """
+        Index a token from the disk cache (see add_tokens), with
+        liquidity_usd replacing the cached liquidity if given
+        """
+        # A duplicate address earlier in the same batch
         if key in self.tokens_by_key:
             return self.tokens_by_key[key]
+        if row['is_scam']:
+            self.scam_tokens.add(key)
+            return ScamTokenError(f"Token {row['unique_key']} is marked as scam")
         
-        # Check scam list
-        if key in self.scam_tokens:
-            raise ScamTokenError(f"Token {key} is marked as scam")
+        token = VerifiedToken(
+            chain_id=self._intern_chain(row['chain_id']),
+            address=row['address'],
+            symbol=sys.intern(row['symbol']),
+            name=row['name'],
+            decimals=row['decimals'],
+            liquidity_usd=row['liquidity_usd'] if liquidity_usd is None else liquidity_usd,
+            holder_count=0,
+            is_verified=bool(row['is_verified']),
+            is_scam=False,
+            # Stored joined; kept as one indicator so scam_reason round-trips
+            scam_indicators=(row['scam_reason'],) if row['scam_reason'] else None,
+            added_timestamp=row['added_timestamp']
+        )
+        self._index(token)
+        return token
+    
+    async def _register(
+        self,
+        chain_id: str,
+        address: str,
+        token_data: Optional['TokenPrice'],
+        verify: bool
+    ) -> Union[VerifiedToken, Exception]:
+        """Verify and index one fetched token (see add_tokens)"""
+        key = self.make_key(chain_id, address)
         
-        # Fetch token data from DexScreener
-        token_data = await self.dex_client.get_token_price(chain_id, address)
+        # A duplicate address earlier in the same batch
+        if key in self.tokens_by_key:
+            return self.tokens_by_key[key]
+        if key in self.scam_tokens:
+            return ScamTokenError(f"Token {self._fmt_key(key)} is marked as scam")
         
         if not token_data:
-            raise NoDataError(f"No data found for {key}")
+            return NoDataError(f"No data found for {self._fmt_key(key)}")
         
         # Verify if requested
         is_verified = False
         is_scam = False
-        scam_reason = None
+        scam_indicators = None
         
         if verify:
             verification = await self._verify_token(chain_id, address, token_data)
             is_verified = verification['is_verified']
             is_scam = verification['is_scam']
-            scam_reason = verification['scam_reason']
-        
-        # Check whitelist
-        if key in self.whitelist:
-            is_verified = True
-            is_scam = False
+            scam_indicators = verification['scam_indicators']
         
         # Create token object
         token = VerifiedToken(
-            chain_id=chain_id,
-            address=address.lower(),
-            symbol=token_data.symbol,
+            chain_id=self._intern_chain(chain_id),
+            address=key[1],
+            symbol=sys.intern(token_data.symbol),
             name=token_data.name,
             decimals=18,  # Default, would need chain-specific lookup
             liquidity_usd=token_data.liquidity_usd,
             holder_count=0,  # Would need blockchain query
             is_verified=is_verified,
             is_scam=is_scam,
-            scam_reason=scam_reason,
-            unique_key=key,
+            scam_indicators=scam_indicators,
             added_timestamp=time.time()
         )
         
         # Add to registries
         if is_scam:
             self.scam_tokens.add(key)
-            logger.warning(f"Scam token detected: {key} - {scam_reason}")
+            logger.warning(f"Scam token detected: {token.unique_key} - {token.scam_reason}")
         else:
-            self.tokens_by_key[key] = token
-            
-            # Update symbol index
-            symbol_key = f"{chain_id}:{token.symbol.upper()}"
-            if symbol_key not in self.addresses_by_symbol:
-                self.addresses_by_symbol[symbol_key] = []
-            self.addresses_by_symbol[symbol_key].append(address.lower())
+            self._index(token)
         
         return token
     
+    def _index(self, token: VerifiedToken):
+        """Add a non-scam token to tokens_by_key and the symbol index"""
+        self.tokens_by_key[(token.chain_id, token.address)] = token
+        
+        # Update symbol index, keeping each bucket sorted by liquidity
+        # (whitelisted tokens, with no liquidity, first)
+        symbol_key = f"{token.chain_id}:{token.symbol.upper()}"
+        sort_keys = self._symbol_sort_keys[symbol_key]
+        sort_key = float('-inf') if token.liquidity_usd is None else -token.liquidity_usd
+        position = bisect.bisect_right(sort_keys, sort_key)
+        sort_keys.insert(position, sort_key)
+        self.addresses_by_symbol[symbol_key].insert(position, token.address)
+    
     async def _verify_token(
         self,
         chain_id: str,
@@ -169,55 +421,50 @@ class TokenRegistry:
         Returns:
             Dictionary with verification results
         """
-        checks_passed = 0
         checks_total = 5
-        scam_indicators = []
         
-        # Check 1: Minimum liquidity
-        if token_data.liquidity_usd >= 100_000:
-            checks_passed += 1
-        else:
-            scam_indicators.append(f"Low liquidity: ${token_data.liquidity_usd:,.0f}")
+        # All five checks up front; the messages are only built for failures
+        liquidity_ok = token_data.liquidity_usd >= 100_000
+        volume_ok = token_data.volume_24h >= 10_000
+        # Not a honeypot pattern (massive one-way volume)
+        ratio_ok = (
+            token_data.volume_24h > 0
+            and 0.1 < token_data.liquidity_usd / token_data.volume_24h < 100  # Normal range
+        )
+        # Price not suspiciously high or low
+        price_ok = 0.000001 < token_data.price_usd < 1_000_000
+        # Has been trading for some time (pairs exist)
+        pairs_ok = token_data.dex_id != 'unknown'
         
-        # Check 2: Trading volume
-        if token_data.volume_24h >= 10_000:
-            checks_passed += 1
-        else:
-            scam_indicators.append(f"Low volume: ${token_data.volume_24h:,.0f}")
+        checks_passed = liquidity_ok + volume_ok + ratio_ok + price_ok + pairs_ok
         
-        # Check 3: Not a honeypot pattern (massive one-way volume)
-        if token_data.volume_24h > 0:
-            liquidity_to_volume_ratio = token_data.liquidity_usd / token_data.volume_24h
-            if 0.1 < liquidity_to_volume_ratio < 100:  # Normal range
-                checks_passed += 1
-            else:
+        scam_indicators = []
+        if checks_passed < checks_total:
+            if not liquidity_ok:
+                scam_indicators.append(f"Low liquidity: ${token_data.liquidity_usd:,.0f}")
+            if not volume_ok:
+                scam_indicators.append(f"Low volume: ${token_data.volume_24h:,.0f}")
+            if not ratio_ok and token_data.volume_24h > 0:
                 scam_indicators.append("Abnormal liquidity/volume ratio")
-        
-        # Check 4: Price not suspiciously high or low
-        if 0.000001 < token_data.price_usd < 1_000_000:
-            checks_passed += 1
-        else:
-            scam_indicators.append(f"Suspicious price: ${token_data.price_usd}")
-        
-        # Check 5: Has been trading for some time (pairs exist)
-        if token_data.dex_id != 'unknown':
-            checks_passed += 1
-        else:
-            scam_indicators.append("No DEX pairs found")
+            if not price_ok:
+                scam_indicators.append(f"Suspicious price: ${token_data.price_usd}")
+            if not pairs_ok:
+                scam_indicators.append("No DEX pairs found")
         
         # Determine verification status
         is_verified = checks_passed >= 4
         is_scam = checks_passed <= 2
         
-        logger.info(
-            f"Token verification for {chain_id}:{address}: "
-            f"{checks_passed}/{checks_total} checks passed"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"Token verification for {chain_id}:{address}: "
+                f"{checks_passed}/{checks_total} checks passed"
+            )
         
         return {
             'is_verified': is_verified,
             'is_scam': is_scam,
-            'scam_reason': ', '.join(scam_indicators) if scam_indicators else None,
+            'scam_indicators': tuple(scam_indicators) if scam_indicators else None,
             'checks_passed': checks_passed,
             'checks_total': checks_total
         }
@@ -233,7 +480,7 @@ class TokenRegistry:
         CRITICAL: This is a guess! Multiple tokens can have same symbol.
         Always confirm with user when ambiguous.
         """
-        symbol_key = f"{chain_id}:{symbol.upper()}"
+        symbol_key = f"{chain_id.lower()}:{symbol.upper()}"
         addresses = self.addresses_by_symbol.get(symbol_key, [])
         
         if not addresses:
@@ -245,25 +492,18 @@ class TokenRegistry:
                 f"Multiple tokens for {symbol} on {chain_id}: {addresses}"
             )
         
-        # Return highest liquidity token
-        tokens = [
-            self.tokens_by_key[self.make_key(chain_id, addr)]
-            for addr in addresses
-            if self.make_key(chain_id, addr) in self.tokens_by_key
-        ]
-        
-        if not tokens:
+        # Return highest liquidity token (buckets are kept sorted by _index)
+        best_token = self.tokens_by_key.get(self.make_key(chain_id, addresses[0]))
+        if best_token is None:
             return None
         
-        # Sort by liquidity
-        tokens.sort(key=lambda t: t.liquidity_usd, reverse=True)
-        
-        best_token = tokens[0]
-        
-        logger.info(
-            f"Resolved {symbol} on {chain_id} to {best_token.address} "
-            f"(liquidity: ${best_token.liquidity_usd:,.0f})"
-        )
+        # Skip formatting the message when INFO is off (the usual case)
+        if logger.isEnabledFor(logging.INFO):
+            liquidity = (
+                "whitelisted" if best_token.liquidity_usd is None
+                else f"liquidity: ${best_token.liquidity_usd:,.0f}"
+            )
+            logger.info(f"Resolved {symbol} on {chain_id} to {best_token.address} ({liquidity})")
         
         return best_token
     
@@ -12,14 +12,17 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from dotenv import load_dotenv
 from app.database import init_db, engine
-from sqlalchemy import text
+from app.utils.log_partitions import maintain_partitions
 
 # Load environment variables
 load_dotenv()
 
 
 def run_migration_sql():
-    """Run SQL migration file"""
+    """
+    Run SQL migration file, then create any remaining SQLAlchemy model
+    tables on the same connection and in the same transaction
+    """
     migration_file = Path(__file__).parent / 'migrate_contract_tables.sql'
     
     if not migration_file.exists():
@@ -30,22 +33,16 @@ def run_migration_sql():
         with open(migration_file, 'r', encoding='utf-8') as f:
             sql = f.read()
         
-        # Split by semicolons and execute each statement
-        statements = [s.strip() for s in sql.split(';') if s.strip() and not s.strip().startswith('--')]
-        
-        with engine.connect() as conn:
-            for statement in statements:
-                if statement:
-                    try:
-                        conn.execute(text(statement))
-                        conn.commit()
-                    except Exception as e:
-                        # Ignore "already exists" errors
-                        if 'already exists' not in str(e).lower() and 'duplicate' not in str(e).lower():
-                            print(f"⚠️  Warning executing statement: {e}")
-                            print(f"   Statement: {statement[:100]}...")
-        
-        print("✅ SQL migration completed")
+        # The file is idempotent (IF NOT EXISTS / OR REPLACE forms), so it runs
+        # as one script in one transaction: a single round trip, and no
+        # splitting that would break on ';' inside $$ function bodies
+        with engine.begin() as conn:
+            conn.exec_driver_sql(sql)
+            print("✅ SQL migration completed")
+            
+            # Initialize SQLAlchemy models (creates tables if they don't exist)
+            init_db(bind=conn)
+            print("✅ SQLAlchemy models initialized")
         return True
         
     except Exception as e:
@@ -75,14 +72,14 @@ def main():
     
     print()
     
-    # Initialize SQLAlchemy models (creates tables if they don't exist)
-    print("🔧 Initializing SQLAlchemy models...")
+    # Daily partitions for api_call_logs (converts an unpartitioned table once)
+    print("🗂️  Preparing api_call_logs partitions...")
     try:
-        init_db()
-        print("✅ SQLAlchemy models initialized")
+        with engine.begin() as conn:
+            maintain_partitions(conn)
+        print("✅ api_call_logs partitions ready")
     except Exception as e:
         print(f"⚠️  Warning: {e}")
-        print("   Tables may already exist, continuing...")
     
     print()
     print("✅ Database initialization complete!")
@@ -92,6 +89,7 @@ def main():
     print("   - pair_contracts")
     print("   - failed_contract_lookups")
     print("   - api_call_logs")
+    print("   - api_call_log_hourly")
     print()
     print("🎉 You can now use the ContractResolver service!")
 
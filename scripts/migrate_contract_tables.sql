@@ -13,11 +13,31 @@ CREATE TABLE IF NOT EXISTS contract_addresses (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     last_verified_at TIMESTAMP,
+    suggested_ttl_seconds INTEGER,
+    last_ttl_updated_at TIMESTAMP,
+    expires_at TIMESTAMP,
     UNIQUE(token_symbol, blockchain, contract_address)
 );
 
+-- Adaptive cache TTL columns for tables created before they existed
+ALTER TABLE contract_addresses ADD COLUMN IF NOT EXISTS suggested_ttl_seconds INTEGER;
+ALTER TABLE contract_addresses ADD COLUMN IF NOT EXISTS last_ttl_updated_at TIMESTAMP;
+
+-- Precomputed expiry, read by the cache instead of last_verified_at + TTL
+ALTER TABLE contract_addresses ADD COLUMN IF NOT EXISTS expires_at TIMESTAMP;
+UPDATE contract_addresses
+    SET expires_at = last_verified_at + COALESCE(suggested_ttl_seconds, 86400) * INTERVAL '1 second'
+    WHERE expires_at IS NULL AND last_verified_at IS NOT NULL;
+
 -- Create indexes for contract_addresses
-CREATE INDEX IF NOT EXISTS idx_token_blockchain ON contract_addresses(token_symbol, blockchain);
+-- Covering index so (token_symbol, blockchain) lookups range-scan unexpired
+-- entries and skip the heap fetch (INCLUDE: every other column the cache reads)
+CREATE INDEX IF NOT EXISTS idx_contract_lookup_cover
+    ON contract_addresses(token_symbol, blockchain, expires_at)
+    INCLUDE (token_name, contract_address, decimals, verified, last_verified_at);
+DROP INDEX IF EXISTS idx_token_blockchain;
+DROP INDEX IF EXISTS idx_token_blockchain_cover;
+DROP INDEX IF EXISTS idx_token_blockchain_expires_cover;
 CREATE INDEX IF NOT EXISTS idx_contract_address ON contract_addresses(contract_address);
 CREATE INDEX IF NOT EXISTS idx_last_verified_at ON contract_addresses(last_verified_at);
 
@@ -55,23 +75,51 @@ CREATE TABLE IF NOT EXISTS failed_contract_lookups (
 -- Create index for failed lookups
 CREATE INDEX IF NOT EXISTS idx_failed_lookups ON failed_contract_lookups(token_symbol, blockchain);
 
--- Create api_call_logs table for tracking API usage
+-- Create api_call_logs table for tracking API usage, partitioned by day on called_at
+-- (an existing unpartitioned table is converted by app/utils/log_partitions.py)
 CREATE TABLE IF NOT EXISTS api_call_logs (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     api_name VARCHAR(50) NOT NULL,
     endpoint VARCHAR(200),
     status_code INTEGER,
     success BOOLEAN DEFAULT FALSE,
     response_time_ms INTEGER,
-    called_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    error_message TEXT
-);
+    called_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    error_message TEXT,
+    PRIMARY KEY (id, called_at)
+) PARTITION BY RANGE (called_at);
+
+-- Catch-all partition; daily partitions are created by app/utils/log_partitions.py
+-- (skipped for a legacy unpartitioned table until it is converted)
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_class WHERE relname = 'api_call_logs' AND relkind = 'p') THEN
+        CREATE TABLE IF NOT EXISTS api_call_logs_default PARTITION OF api_call_logs DEFAULT;
+    END IF;
+END
+$$;
 
 -- Create indexes for API logs
 CREATE INDEX IF NOT EXISTS idx_api_name ON api_call_logs(api_name);
-CREATE INDEX IF NOT EXISTS idx_called_at ON api_call_logs(called_at);
+CREATE INDEX IF NOT EXISTS idx_called_at_brin ON api_call_logs USING BRIN (called_at);
+DROP INDEX IF EXISTS idx_called_at;
 CREATE INDEX IF NOT EXISTS idx_api_success ON api_call_logs(success, called_at);
 
+-- Create hourly rollup of api_call_logs (upserted on every logged call)
+CREATE TABLE IF NOT EXISTS api_call_log_hourly (
+    id SERIAL PRIMARY KEY,
+    api_name VARCHAR(50) NOT NULL,
+    hour_bucket TIMESTAMP NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    success INTEGER NOT NULL DEFAULT 0,
+    failure INTEGER NOT NULL DEFAULT 0,
+    sum_response_time_ms BIGINT NOT NULL DEFAULT 0,
+    response_count INTEGER NOT NULL DEFAULT 0,
+    CONSTRAINT uq_api_call_log_hourly UNIQUE(api_name, hour_bucket)
+);
+
+CREATE INDEX IF NOT EXISTS idx_hourly_bucket ON api_call_log_hourly(hour_bucket);
+
 -- Create function to update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -82,9 +130,11 @@ END;
 $$ language 'plpgsql';
 
 -- Create triggers for updated_at
+DROP TRIGGER IF EXISTS update_contract_addresses_updated_at ON contract_addresses;
 CREATE TRIGGER update_contract_addresses_updated_at BEFORE UPDATE ON contract_addresses
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+DROP TRIGGER IF EXISTS update_pair_contracts_updated_at ON pair_contracts;
 CREATE TRIGGER update_pair_contracts_updated_at BEFORE UPDATE ON pair_contracts
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
@@ -1,8 +1,10 @@
 /**
  * TypeScript handler for /contracts and /api_stats commands
- * Integrates with Python contract resolver via subprocess
+ * Integrates with Python contract resolver via its Unix-socket server,
+ * falling back to a one-shot subprocess when the server is not running
  */
 import TelegramBot from 'node-telegram-bot-api';
+import http from 'http';
 import { exec } from 'child_process';
 import { promisify } from 'util';
 import { DatabaseManager } from '../../database/Database.js';
@@ -10,6 +12,55 @@ import { i18n } from '../../utils/i18n.js';
 
 const execAsync = promisify(exec);
 
+// Socket of the persistent bridge: python app/integration_bridge.py serve
+const BRIDGE_SOCKET = process.env.CONTRACTS_BRIDGE_SOCKET || '/tmp/contracts.sock';
+const BRIDGE_TIMEOUT_MS = 10000;
+
+function requestBridgeSocket(path: string): Promise<any> {
+  return new Promise((resolve, reject) => {
+    const req = http.request(
+      { socketPath: BRIDGE_SOCKET, path, method: 'GET', timeout: BRIDGE_TIMEOUT_MS },
+      (res) => {
+        let body = '';
+        res.setEncoding('utf8');
+        res.on('data', (chunk) => (body += chunk));
+        res.on('end', () => {
+          try {
+            resolve(JSON.parse(body));
+          } catch (error) {
+            reject(error);
+          }
+        });
+      }
+    );
+    req.on('timeout', () => req.destroy(new Error('Python bridge socket timeout')));
+    req.on('error', reject);
+    req.end();
+  });
+}
+
+async function callPythonBridge(path: string, cliArgs: string): Promise<any> {
+  try {
+    return await requestBridgeSocket(path);
+  } catch (error: any) {
+    if (error?.code !== 'ENOENT' && error?.code !== 'ECONNREFUSED') {
+      throw error;
+    }
+  }
+
+  // No persistent bridge running - spawn a one-shot process
+  const { stdout, stderr } = await execAsync(`python app/integration_bridge.py ${cliArgs}`, {
+    timeout: BRIDGE_TIMEOUT_MS,
+    maxBuffer: 1024 * 1024, // 1MB buffer
+  });
+
+  if (stderr && !stderr.includes('Warning')) {
+    console.error('Python bridge stderr:', stderr);
+  }
+
+  return JSON.parse(stdout);
+}
+
 export class ContractsCommandHandler {
   private bot: TelegramBot;
   private db: DatabaseManager;
@@ -77,20 +128,13 @@ export class ContractsCommandHandler {
       );
 
       // Call Python bridge
-      const pythonScript = 'app/integration_bridge.py';
-      const command = `python ${pythonScript} contracts "${pair}" ${blockchain} ${lng}`;
+      const query = new URLSearchParams({ pair, blockchain, language: lng });
 
       try {
-        const { stdout, stderr } = await execAsync(command, {
-          timeout: 10000, // 10 second timeout
-          maxBuffer: 1024 * 1024, // 1MB buffer
-        });
-
-        if (stderr && !stderr.includes('Warning')) {
-          console.error('Python bridge stderr:', stderr);
-        }
-
-        const result = JSON.parse(stdout);
+        const result = await callPythonBridge(
+          `/contracts?${query}`,
+          `contracts "${pair}" ${blockchain} ${lng}`
+        );
 
         // Delete processing message
         await this.bot.deleteMessage(msg.chat.id, processingMsg.message_id);
@@ -148,20 +192,13 @@ export class ContractsCommandHandler {
       );
 
       // Call Python bridge
-      const pythonScript = 'app/integration_bridge.py';
-      const command = `python ${pythonScript} api_stats ${hours} ${lng}`;
+      const query = new URLSearchParams({ hours: String(hours), language: lng });
 
       try {
-        const { stdout, stderr } = await execAsync(command, {
-          timeout: 10000,
-          maxBuffer: 1024 * 1024,
-        });
-
-        if (stderr && !stderr.includes('Warning')) {
-          console.error('Python bridge stderr:', stderr);
-        }
-
-        const result = JSON.parse(stdout);
+        const result = await callPythonBridge(
+          `/api_stats?${query}`,
+          `api_stats ${hours} ${lng}`
+        );
 
         // Delete processing message
         await this.bot.deleteMessage(msg.chat.id, processingMsg.message_id);
@@ -16,135 +16,140 @@ logging.basicConfig(
 )
 
 
-async def test_chain_normalization():
+async def test_chain_normalization(client: DexScreenerClient):
     """Test chain ID normalization"""
-    print("\n=== Testing Chain Normalization ===")
+    lines = ["\n=== Testing Chain Normalization ==="]
     
-    async with DexScreenerClient() as client:
-        test_cases = [
-            ('ETH', 'ethereum'),
-            ('Ethereum', 'ethereum'),
-            ('ethereum', 'ethereum'),
-            ('BSC', 'bsc'),
-            ('bnb', 'bsc'),
-            ('MATIC', 'polygon'),
-            ('poly', 'polygon'),
-        ]
-        
-        for input_chain, expected in test_cases:
-            try:
-                normalized = client.normalize_chain_id(input_chain)
-                status = "✅" if normalized == expected else "❌"
-                print(f"{status} '{input_chain}' -> '{normalized}' (expected: '{expected}')")
-            except InvalidChainError as e:
-                print(f"❌ '{input_chain}' -> Error: {e}")
+    test_cases = [
+        ('ETH', 'ethereum'),
+        ('Ethereum', 'ethereum'),
+        ('ethereum', 'ethereum'),
+        ('BSC', 'bsc'),
+        ('bnb', 'bsc'),
+        ('MATIC', 'polygon'),
+        ('poly', 'polygon'),
+    ]
+    
+    for input_chain, expected in test_cases:
+        try:
+            normalized = client.normalize_chain_id(input_chain)
+            status = "✅" if normalized == expected else "❌"
+            lines.append(f"{status} '{input_chain}' -> '{normalized}' (expected: '{expected}')")
+        except InvalidChainError as e:
+            lines.append(f"❌ '{input_chain}' -> Error: {e}")
+    
+    return lines
 
 
-async def test_token_lookup():
+async def test_token_lookup(client: DexScreenerClient):
     """Test token price lookup with proper chain context"""
-    print("\n=== Testing Token Lookup ===")
+    lines = ["\n=== Testing Token Lookup ==="]
     
-    async with DexScreenerClient() as client:
-        # USDC on Ethereum
-        usdc_eth = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
-        
-        try:
-            price = await client.get_token_price("ethereum", usdc_eth)
-            if price:
-                print(f"✅ USDC on Ethereum:")
-                print(f"   Symbol: {price.symbol}")
-                print(f"   Chain: {price.chain_id}")
-                print(f"   Address: {price.contract_address}")
-                print(f"   Price: ${price.price_usd:.4f}")
-                print(f"   Liquidity: ${price.liquidity_usd:,.0f}")
-                print(f"   Unique Key: {price.unique_key}")
-        except Exception as e:
-            print(f"❌ Error: {e}")
-
-
-async def test_token_registry():
+    # USDC on Ethereum
+    usdc_eth = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+    
+    try:
+        price = await client.get_token_price("ethereum", usdc_eth)
+        if price:
+            lines.append(f"✅ USDC on Ethereum:")
+            lines.append(f"   Symbol: {price.symbol}")
+            lines.append(f"   Chain: {price.chain_id}")
+            lines.append(f"   Address: {price.contract_address}")
+            lines.append(f"   Price: ${price.price_usd:.4f}")
+            lines.append(f"   Liquidity: ${price.liquidity_usd:,.0f}")
+            lines.append(f"   Unique Key: {price.unique_key}")
+    except Exception as e:
+        lines.append(f"❌ Error: {e}")
+    
+    return lines
+
+
+async def test_token_registry(client: DexScreenerClient):
     """Test token registry with verification"""
-    print("\n=== Testing Token Registry ===")
+    lines = ["\n=== Testing Token Registry ==="]
     
-    async with DexScreenerClient() as client:
-        registry = TokenRegistry(client)
-        
-        # Test adding a legitimate token
-        usdc_eth = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
-        
-        try:
-            token = await registry.add_token("ethereum", usdc_eth, verify=True)
-            print(f"✅ Added token to registry:")
-            print(f"   Symbol: {token.symbol}")
-            print(f"   Chain: {token.chain_id}")
-            print(f"   Address: {token.address}")
-            print(f"   Verified: {token.is_verified}")
-            print(f"   Is Scam: {token.is_scam}")
-            print(f"   Tradeable: {token.is_tradeable}")
-            print(f"   Unique Key: {token.unique_key}")
-        except ScamTokenError as e:
-            print(f"❌ Scam token detected: {e}")
-        except NoDataError as e:
-            print(f"❌ No data: {e}")
-        except Exception as e:
-            print(f"❌ Error: {e}")
-
-
-async def test_cross_chain_identification():
+    registry = TokenRegistry(client)
+    
+    # Test adding a legitimate token
+    usdc_eth = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+    
+    try:
+        token = await registry.add_token("ethereum", usdc_eth, verify=True)
+        lines.append(f"✅ Added token to registry:")
+        lines.append(f"   Symbol: {token.symbol}")
+        lines.append(f"   Chain: {token.chain_id}")
+        lines.append(f"   Address: {token.address}")
+        lines.append(f"   Verified: {token.is_verified}")
+        lines.append(f"   Is Scam: {token.is_scam}")
+        lines.append(f"   Tradeable: {token.is_tradeable}")
+        lines.append(f"   Unique Key: {token.unique_key}")
+    except ScamTokenError as e:
+        lines.append(f"❌ Scam token detected: {e}")
+    except NoDataError as e:
+        lines.append(f"❌ No data: {e}")
+    except Exception as e:
+        lines.append(f"❌ Error: {e}")
+    
+    return lines
+
+
+async def test_cross_chain_identification(client: DexScreenerClient):
     """Test that tokens are properly identified by chain:address"""
-    print("\n=== Testing Cross-Chain Identification ===")
+    lines = ["\n=== Testing Cross-Chain Identification ==="]
     
-    async with DexScreenerClient() as client:
-        registry = TokenRegistry(client)
+    registry = TokenRegistry(client)
+    
+    # USDT exists on multiple chains
+    usdt_eth = "0xdAC17F958D2ee523a2206206994597C13D831ec7"  # Ethereum
+    usdt_bsc = "0x55d398326f99059fF775485246999027B3197955"  # BSC
+    
+    try:
+        token_eth = await registry.add_token("ethereum", usdt_eth, verify=False)
+        token_bsc = await registry.add_token("bsc", usdt_bsc, verify=False)
         
-        # USDT exists on multiple chains
-        usdt_eth = "0xdAC17F958D2ee523a2206206994597C13D831ec7"  # Ethereum
-        usdt_bsc = "0x55d398326f99059fF775485246999027B3197955"  # BSC
+        lines.append(f"✅ Ethereum USDT:")
+        lines.append(f"   Key: {token_eth.unique_key}")
+        lines.append(f"   Address: {token_eth.address}")
         
-        try:
-            token_eth = await registry.add_token("ethereum", usdt_eth, verify=False)
-            token_bsc = await registry.add_token("bsc", usdt_bsc, verify=False)
-            
-            print(f"✅ Ethereum USDT:")
-            print(f"   Key: {token_eth.unique_key}")
-            print(f"   Address: {token_eth.address}")
-            
-            print(f"✅ BSC USDT:")
-            print(f"   Key: {token_bsc.unique_key}")
-            print(f"   Address: {token_bsc.address}")
+        lines.append(f"✅ BSC USDT:")
+        lines.append(f"   Key: {token_bsc.unique_key}")
+        lines.append(f"   Address: {token_bsc.address}")
+        
+        # Verify they are different
+        if token_eth.unique_key != token_bsc.unique_key:
+            lines.append("✅ Tokens correctly identified as different (different chains)")
+        else:
+            lines.append("❌ Tokens incorrectly identified as same")
             
-            # Verify they are different
-            if token_eth.unique_key != token_bsc.unique_key:
-                print("✅ Tokens correctly identified as different (different chains)")
-            else:
-                print("❌ Tokens incorrectly identified as same")
-                
-        except Exception as e:
-            print(f"❌ Error: {e}")
+    except Exception as e:
+        lines.append(f"❌ Error: {e}")
+    
+    return lines
 
 
-async def test_metrics():
+async def test_metrics(client: DexScreenerClient):
     """Test client metrics"""
-    print("\n=== Testing Metrics ===")
+    lines = ["\n=== Testing Metrics ==="]
     
-    async with DexScreenerClient() as client:
-        # Make some requests
-        usdc_eth = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+    # Make some requests
+    usdc_eth = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+    
+    try:
+        await client.get_token_price("ethereum", usdc_eth)
+        await client.get_token_price("ethereum", usdc_eth)  # Should hit cache
         
-        try:
-            await client.get_token_price("ethereum", usdc_eth)
-            await client.get_token_price("ethereum", usdc_eth)  # Should hit cache
-            
-            metrics = client.get_metrics()
-            print(f"✅ Metrics:")
-            print(f"   Success: {metrics['requests_success']}")
-            print(f"   Failed: {metrics['requests_failed']}")
-            print(f"   Cache Hits: {metrics['cache_hits']}")
-            print(f"   Cache Misses: {metrics['cache_misses']}")
-            print(f"   Cache Size: {metrics['cache_size']}")
-            print(f"   Circuit Breaker: {metrics['circuit_breaker_state']}")
-        except Exception as e:
-            print(f"❌ Error: {e}")
+        metrics = client.get_metrics()
+        lines.append(f"✅ Metrics:")
+        lines.append(f"   Success: {metrics['requests_success']}")
+        lines.append(f"   Failed: {metrics['requests_failed']}")
+        lines.append(f"   Cache Hits: {metrics['cache_hits']}")
+        lines.append(f"   Cache Misses: {metrics['cache_misses']}")
+        lines.append(f"   Cache Size: {metrics['cache_size']}")
+        lines.append(f"   Circuit Breaker: {metrics['circuit_breaker_state']}")
+    except Exception as e:
+        lines.append(f"❌ Error: {e}")
+    
+    return lines
 
 
 async def main():
@@ -153,11 +158,20 @@ async def main():
     print("DexScreener Client & Token Registry Test Suite")
     print("=" * 60)
     
-    await test_chain_normalization()
-    await test_token_lookup()
-    await test_token_registry()
-    await test_cross_chain_identification()
-    await test_metrics()
+    # One client for the whole run, so repeated lookups share its cache
+    # and connections (test_metrics then reports the run's cache hits)
+    async with DexScreenerClient() as client:
+        # Independent tests run concurrently; each returns its output lines so
+        # they still print in order
+        results = await asyncio.gather(
+            test_chain_normalization(client),
+            test_token_lookup(client),
+            test_token_registry(client),
+            test_cross_chain_identification(client)
+        )
+        results.append(await test_metrics(client))
+    for lines in results:
+        print("\n".join(lines))
     
     print("\n" + "=" * 60)
     print("Tests completed!")
@@ -1,9 +1,24 @@
 import asyncio
+import functools
+import random
 import time
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 from dataclasses import dataclass
 import aiohttp
+import orjson
+from cachetools import TLRUCache, TTLCache
 from enum import Enum
+from operator import attrgetter
+from types import MappingProxyType
+
+from app.services.api_clients.lookup_cache import in_flight, single_flight
+
+try:
+    import httpx
+    import h2  # noqa: F401  (required by httpx for http2=True)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 
 # CRITICAL: DexScreener requires exact lowercase chain identifiers
@@ -14,6 +29,37 @@ DEXSCREENER_CHAINS = {
 }
 
 
+# Fresh cache lifetime by liquidity: (minimum liquidity_usd, TTL seconds),
+# highest first. Deep pools move slowly; thin ones can move within seconds.
+DEFAULT_CACHE_POLICY: Tuple[Tuple[float, float], ...] = (
+    (10_000_000, 60),
+    (1_000_000, 30),
+    (0, 10),
+)
+
+# Prices older than this are stale; they are only served (from the stale
+# cache) when the API is failing
+STALE_AFTER_SECONDS = 300
+STALE_CACHE_TTL_SECONDS = 3600
+
+
+# Responses larger than this (batched /tokens calls) are parsed in a worker
+# thread so the event loop keeps serving other requests
+THREADED_PARSE_BYTES = 64_000
+
+# Search responses are read up to this size and rejected beyond it, so a
+# broad query can't buffer an unbounded body
+MAX_SEARCH_RESPONSE_BYTES = 2_000_000
+
+
+# Timeouts, resets, DNS errors
+TRANSPORT_ERRORS = (aiohttp.ClientError,)
+TIMEOUT_ERRORS = (asyncio.TimeoutError,)
+if HTTP2_AVAILABLE:
+    TRANSPORT_ERRORS += (httpx.TransportError,)
+    TIMEOUT_ERRORS += (httpx.TimeoutException,)
+
+
 # Common user inputs that need normalization
 CHAIN_ALIASES = {
     'eth': 'ethereum',
@@ -31,6 +77,21 @@ CHAIN_ALIASES = {
 }
 
 
+# Shared stand-in for missing/null nested objects in API payloads
+_EMPTY = MappingProxyType({})
+
+
+# Lowercase chain input -> DexScreener chain ID, for canonical names and aliases
+_CHAIN_RESOLVE = {**{chain: chain for chain in DEXSCREENER_CHAINS}, **CHAIN_ALIASES}
+
+# For InvalidChainError messages (lru_cache doesn't memoize raised errors)
+_VALID_CHAINS_MSG = ', '.join(sorted(DEXSCREENER_CHAINS))
+
+
+# Sort/max key for TokenPrice lists
+_BY_LIQUIDITY = attrgetter('liquidity_usd')
+
+
 class DexScreenerError(Exception):
     """Base exception for DexScreener API errors"""
     pass
@@ -51,7 +112,7 @@ class NoLiquidityError(DexScreenerError):
     pass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TokenPrice:
     """Structured token price data with full context"""
     chain_id: str
@@ -65,8 +126,12 @@ class TokenPrice:
     price_change_24h: float
     dex_id: str
     pair_address: str
-    unique_key: str  # Format: "chain:address"
-    timestamp: int
+    timestamp: float  # Unix time
+    
+    @property
+    def unique_key(self) -> str:
+        """Format: "chain:address" (derived rather than stored per pair)"""
+        return f"{self.chain_id}:{self.contract_address}"
     
     @property
     def is_liquid(self) -> bool:
@@ -77,6 +142,11 @@ class TokenPrice:
     def age_seconds(self) -> float:
         """How old is this price data"""
         return time.time() - self.timestamp
+    
+    @property
+    def is_stale(self) -> bool:
+        """Older than STALE_AFTER_SECONDS (served from the stale cache during an outage)"""
+        return self.age_seconds >= STALE_AFTER_SECONDS
 
 
 class TokenBucketRateLimiter:
@@ -87,37 +157,61 @@ class TokenBucketRateLimiter:
     """
     def __init__(self, requests_per_minute: int):
         self.capacity = requests_per_minute
+        self.refill_per_sec = requests_per_minute / 60
         self.tokens = requests_per_minute
-        self.last_update = time.time()
+        # Monotonic: wall-clock jumps (NTP) must not refill or drain the bucket
+        self.last_update = time.monotonic()
+        # Only taken by callers that have to wait, which it keeps in FIFO order
         self.lock = asyncio.Lock()
     
+    def _refill(self):
+        """Add the tokens accrued since the last update"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_update) * self.refill_per_sec)
+        self.last_update = now
+    
     async def acquire(self):
         """Wait if necessary and consume one token"""
+        # Fast path, unless others are already waiting: nothing awaits between
+        # the check and the decrement, so no lock is needed
+        if not self.lock.locked():
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+        
         async with self.lock:
-            now = time.time()
-            elapsed = now - self.last_update
-            
-            # Refill tokens based on time passed
-            refill = elapsed * (self.capacity / 60)
-            self.tokens = min(self.capacity, self.tokens + refill)
-            self.last_update = now
-            
+            self._refill()
             if self.tokens < 1:
-                # Calculate wait time
-                wait_time = (1 - self.tokens) * 60 / self.capacity
-                await asyncio.sleep(wait_time)
-                self.tokens = 0
-            else:
-                self.tokens -= 1
+                await asyncio.sleep((1 - self.tokens) / self.refill_per_sec)
+                self._refill()
+            self.tokens -= 1
 
 
 class CircuitBreaker:
-    """Prevents death spiral when API is failing"""
-    def __init__(self, failure_threshold: int = 5, timeout_seconds: int = 60):
-        self.failure_threshold = failure_threshold
+    """
+    Prevents death spiral when API is failing
+    
+    Trips on an exponentially weighted error rate rather than a run of
+    consecutive failures: an API that alternates success and failure still
+    opens it, while an isolated failure does not.
+    """
+    def __init__(
+        self,
+        error_threshold: float = 0.5,
+        alpha: float = 0.1,
+        min_samples: int = 10,
+        timeout_seconds: int = 60
+    ):
+        self.error_threshold = error_threshold
+        self.alpha = alpha  # Weight of the latest outcome
+        self.min_samples = min_samples
         self.timeout_seconds = timeout_seconds
-        self.failures = 0
-        self.last_failure_time = None
+        self.error_rate = 0.0
+        self.sample_count = 0
+        # time.monotonic(), like the rate limiters: a wall-clock jump must not
+        # close the circuit early or keep it open
+        self.opened_at = None
         self.state = 'closed'  # closed, open, half-open
     
     @property
@@ -127,25 +221,52 @@ class CircuitBreaker:
         
         if self.state == 'open':
             # Check if timeout has passed
-            if time.time() - self.last_failure_time > self.timeout_seconds:
+            if time.monotonic() - self.opened_at > self.timeout_seconds:
                 self.state = 'half-open'
                 return False
             return True
         
         return False
     
+    def _record(self, is_failure: bool):
+        """Fold one outcome into the error rate"""
+        self.error_rate = self.alpha * is_failure + (1 - self.alpha) * self.error_rate
+        self.sample_count += 1
+    
     def record_success(self):
-        """Reset circuit breaker on success"""
-        self.failures = 0
-        self.state = 'closed'
+        """Track a success; a successful half-open probe closes the circuit"""
+        if self.state == 'half-open':
+            # Start over rather than carry the outage's error rate forward
+            self.error_rate = 0.0
+            self.sample_count = 0
+            self.state = 'closed'
+        self._record(False)
     
     def record_failure(self):
-        """Track failures and open circuit if threshold reached"""
-        self.failures += 1
-        self.last_failure_time = time.time()
+        """Track a failure and open the circuit if the error rate is too high"""
+        self._record(True)
         
-        if self.failures >= self.failure_threshold:
+        # A failed half-open probe reopens immediately
+        if self.state == 'half-open' or (
+            self.sample_count >= self.min_samples and self.error_rate > self.error_threshold
+        ):
             self.state = 'open'
+            self.opened_at = time.monotonic()
+
+
+@functools.lru_cache(maxsize=512)
+def _normalize_chain_id(chain_input: str) -> str:
+    """DexScreenerClient.normalize_chain_id, memoized (the input domain is tiny)"""
+    if not chain_input:
+        raise InvalidChainError("Chain identifier cannot be empty")
+    
+    try:
+        return _CHAIN_RESOLVE[chain_input.lower().strip()]
+    except KeyError:
+        raise InvalidChainError(
+            f"Invalid chain: '{chain_input}'. "
+            f"Valid chains: {_VALID_CHAINS_MSG}"
+        ) from None
 
 
 class DexScreenerClient:
@@ -159,16 +280,30 @@ class DexScreenerClient:
     """
     
     BASE_URL = "https://api.dexscreener.com/latest/dex"
+    # Multi-token endpoint: /tokens/v1/{chain}/{addr1,addr2,...}
+    TOKENS_URL = "https://api.dexscreener.com/tokens/v1"
+    MAX_TOKENS_PER_REQUEST = 30
     
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrency: int = 20,
+        cache_policy: Sequence[Tuple[float, float]] = DEFAULT_CACHE_POLICY
+    ):
         self.session: Optional[aiohttp.ClientSession] = None
+        # Used instead of the aiohttp session when httpx[http2] is installed
+        self.http2_client: Optional['httpx.AsyncClient'] = None
         self.pair_limiter = TokenBucketRateLimiter(300)  # 300/min for pairs
         self.profile_limiter = TokenBucketRateLimiter(60)  # 60/min for profiles
         self.circuit_breaker = CircuitBreaker()
+        # Caps requests in flight; the rate limiters only pace them over time
+        self.sem = asyncio.Semaphore(max_concurrency)
         
-        # Cache for successful lookups (5 minute TTL)
-        self.cache: Dict[str, tuple] = {}
-        self.cache_ttl = 300  # 5 minutes
+        # Cache for successful lookups: most liquid pair per token, each
+        # entry kept for the cache_policy TTL of its liquidity
+        self.cache_policy = tuple(sorted(cache_policy, reverse=True))
+        self.cache: TLRUCache = TLRUCache(maxsize=10_000, ttu=self._cache_ttu)
+        # Last known prices, served when the API fails or the circuit is open
+        self.stale_cache: TTLCache = TTLCache(maxsize=10_000, ttl=STALE_CACHE_TTL_SECONDS)
         
         # Metrics tracking
         self.metrics = {
@@ -176,17 +311,44 @@ class DexScreenerClient:
             'requests_failed': 0,
             'cache_hits': 0,
             'cache_misses': 0,
+            'inflight_joins': 0,  # Misses that awaited another caller's request
             'rate_limit_waits': 0,
+            'stale_served': 0,
+            'retry_after_honored': 0,
             'chain_errors': {}  # Track errors per chain
         }
     
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession()
+        if HTTP2_AVAILABLE:
+            # Concurrent lookups multiplex over one TLS connection
+            self.http2_client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                timeout=httpx.Timeout(10.0)
+            )
+            return self
+        
+        # One pooled keep-alive session for the client's lifetime: every
+        # request goes to the same host, so reused connections skip the
+        # TCP/TLS handshake
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=30,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
+        if self.http2_client:
+            await self.http2_client.aclose()
         if self.session:
             await self.session.close()
     
@@ -200,35 +362,76 @@ class DexScreenerClient:
             'bnb' -> 'bsc'
             'MATIC' -> 'polygon'
         """
-        if not chain_input:
-            raise InvalidChainError("Chain identifier cannot be empty")
-        
-        # Convert to lowercase and strip whitespace
-        normalized = chain_input.lower().strip()
-        
-        # Check aliases first
-        if normalized in CHAIN_ALIASES:
-            normalized = CHAIN_ALIASES[normalized]
-        
-        # Validate against known chains
-        if normalized not in DEXSCREENER_CHAINS:
-            raise InvalidChainError(
-                f"Invalid chain: '{chain_input}'. "
-                f"Valid chains: {', '.join(sorted(DEXSCREENER_CHAINS))}"
-            )
-        
-        return normalized
+        return _normalize_chain_id(chain_input)
     
     def make_unique_key(self, chain_id: str, address: str) -> str:
         """Create unique identifier for token"""
         return f"{chain_id.lower()}:{address.lower()}"
     
-    async def _fetch(self, endpoint: str, is_profile: bool = False) -> dict:
-        """Internal fetch with retry logic and circuit breaker"""
+    @staticmethod
+    def _make_key_fast(chain_id_lc: str, addr_lc: str) -> str:
+        """make_unique_key for inputs that are already lowercase"""
+        return f"{chain_id_lc}:{addr_lc}"
+    
+    def _is_open(self) -> bool:
+        """Whether the client has an open HTTP session (see __aenter__)"""
+        if self.http2_client is not None:
+            return not self.http2_client.is_closed
+        return self.session is not None and not self.session.closed
+    
+    async def _get(self, url: str, max_bytes: Optional[int] = None) -> tuple:
+        """
+        GET url over the HTTP/2 client or the aiohttp session: (status, headers, body)
+        
+        With max_bytes, the body is read in chunks and DexScreenerError is
+        raised as soon as it grows past that size
+        """
+        if self.http2_client is not None:
+            if max_bytes is None:
+                response = await self.http2_client.get(url)
+                return response.status_code, response.headers, response.content
+            async with self.http2_client.stream('GET', url) as response:
+                body = await self._read_capped(response.aiter_bytes(), max_bytes)
+                return response.status_code, response.headers, body
+        async with self.session.get(url) as response:
+            if max_bytes is None:
+                return response.status, response.headers, await response.read()
+            body = await self._read_capped(response.content.iter_chunked(65536), max_bytes)
+            return response.status, response.headers, body
+    
+    @staticmethod
+    async def _read_capped(chunks, max_bytes: int) -> bytes:
+        """Join a response body's chunks, raising DexScreenerError past max_bytes"""
+        body = bytearray()
+        async for chunk in chunks:
+            body += chunk
+            if len(body) > max_bytes:
+                raise DexScreenerError(f"Response exceeds {max_bytes} bytes")
+        return bytes(body)
+    
+    @staticmethod
+    def _retry_after(headers) -> Optional[float]:
+        """Seconds from a numeric Retry-After header, or None"""
+        try:
+            return float(headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return None
+    
+    async def _fetch(
+        self,
+        endpoint: str,
+        is_profile: bool = False,
+        base_url: str = None,
+        max_bytes: Optional[int] = None
+    ) -> dict:
+        """Internal fetch with retry logic and circuit breaker (max_bytes: see _get)"""
         
         if self.circuit_breaker.is_open:
             raise DexScreenerError("Circuit breaker is open due to repeated failures")
         
+        if not self._is_open():
+            raise DexScreenerError("Client session is not open (use 'async with DexScreenerClient()')")
+        
         # Select appropriate rate limiter
         limiter = self.profile_limiter if is_profile else self.pair_limiter
         
@@ -237,44 +440,68 @@ class DexScreenerClient:
         
         for attempt in range(max_retries):
             try:
-                # Rate limiting
-                await limiter.acquire()
-                
-                if not self.session:
-                    self.session = aiohttp.ClientSession()
-                
-                url = f"{self.BASE_URL}/{endpoint}"
+                # Held for the request only, not for backoff sleeps
+                async with self.sem:
+                    # Rate limiting
+                    await limiter.acquire()
+                    
+                    url = f"{base_url or self.BASE_URL}/{endpoint}"
+                    
+                    status, headers, body = await self._get(url, max_bytes)
                 
-                async with self.session.get(url, timeout=10) as response:
-                    if response.status == 200:
+                if status == 200:
+                    # orjson, and no Content-Type check (charset variants, text/plain);
+                    # a non-JSON body (HTML error page) is retried like a network error
+                    try:
+                        if len(body) > THREADED_PARSE_BYTES:
+                            data = await asyncio.to_thread(orjson.loads, body)
+                        else:
+                            data = orjson.loads(body)
+                    except orjson.JSONDecodeError:
+                        last_error = DexScreenerError(f"Invalid JSON response for {endpoint}")
+                    else:
                         self.circuit_breaker.record_success()
                         self.metrics['requests_success'] += 1
-                        return await response.json()
-                    
-                    elif response.status == 429:
-                        # Rate limit hit
-                        self.metrics['rate_limit_waits'] += 1
-                        wait_time = min(2 ** attempt * 2, 30)  # Exponential backoff, max 30s
-                        
-                        print(f"Rate limited. Waiting {wait_time}s...")
-                        await asyncio.sleep(wait_time)
-                        continue
-                    
-                    elif response.status == 404:
-                        # Chain or token not found
-                        error_text = await response.text()
-                        raise DexScreenerError(f"Not found: {endpoint}. Response: {error_text}")
-                    
+                        return data
+                
+                elif status == 429:
+                    # Rate limit hit
+                    self.metrics['rate_limit_waits'] += 1
+                    # Jittered so concurrent callers don't retry in lockstep
+                    retry_after = self._retry_after(headers)
+                    if retry_after is not None:
+                        self.metrics['retry_after_honored'] += 1
+                        wait_time = retry_after + random.uniform(0, 0.5)
                     else:
-                        error_text = await response.text()
-                        raise DexScreenerError(
-                            f"API error {response.status}: {error_text}"
-                        )
+                        wait_time = min(2 ** attempt, 30) + random.uniform(0, 1)  # Exponential backoff
+                    
+                    print(f"Rate limited. Waiting {wait_time:.1f}s...")
+                    await asyncio.sleep(wait_time)
+                    continue
+                
+                elif status == 404:
+                    # Chain or token not found (not an API failure: bypasses the breaker)
+                    error_text = body.decode('utf-8', 'replace')
+                    raise DexScreenerError(f"Not found: {endpoint}. Response: {error_text}")
+                
+                elif status >= 500:
+                    # Server error: retried, and counted by the breaker if all attempts fail
+                    error_text = body.decode('utf-8', 'replace')
+                    last_error = DexScreenerError(f"API error {status}: {error_text}")
+                
+                else:
+                    # Other client errors won't change on retry
+                    self.circuit_breaker.record_failure()
+                    self.metrics['requests_failed'] += 1
+                    error_text = body.decode('utf-8', 'replace')
+                    raise DexScreenerError(
+                        f"API error {status}: {error_text}"
+                    )
                         
-            except asyncio.TimeoutError:
+            except TIMEOUT_ERRORS:
                 last_error = DexScreenerError(f"Request timeout for {endpoint}")
                 
-            except aiohttp.ClientError as e:
+            except TRANSPORT_ERRORS as e:
                 last_error = DexScreenerError(f"Network error: {str(e)}")
             
             # Wait before retry
@@ -290,30 +517,72 @@ class DexScreenerClient:
         else:
             raise DexScreenerError(f"Failed to fetch {endpoint} after {max_retries} attempts")
     
-    async def get_token_pairs(self, chain: str, token_address: str) -> List[TokenPrice]:
+    async def get_token_pairs(self, chain: str, token_address: str, sort: bool = False) -> List[TokenPrice]:
         """
         Get all pairs for a specific token on a specific chain
         
         Args:
             chain: Chain identifier (will be normalized)
             token_address: Contract address of token
+            sort: Order the pairs by liquidity, highest first
             
         Returns:
-            List of TokenPrice objects for all pairs
+            List of TokenPrice objects for all pairs (in API order unless sort)
         """
         # Normalize chain
         chain_normalized = self.normalize_chain_id(chain)
         
         # Check cache
-        cache_key = self.make_unique_key(chain_normalized, token_address)
-        if cache_key in self.cache:
-            cached_data, cached_time = self.cache[cache_key]
-            if time.time() - cached_time < self.cache_ttl:
-                self.metrics['cache_hits'] += 1
-                return [cached_data]
-        
-        self.metrics['cache_misses'] += 1
+        cache_key = self._make_key_fast(chain_normalized, token_address.lower())
+        try:
+            cached = self.cache[cache_key]
+            self.metrics['cache_hits'] += 1
+            return [cached]
+        except KeyError:
+            pass
         
+        # Concurrent misses on one token share one request, which runs as its
+        # own task: cancelling any caller (even the first) doesn't cancel it
+        flight_key = ('dexscreener', id(self), cache_key)
+        if in_flight(flight_key):
+            self.metrics['inflight_joins'] += 1
+        else:
+            self.metrics['cache_misses'] += 1
+        results = await single_flight(
+            flight_key,
+            lambda: self._fetch_token_pairs_or_stale(chain_normalized, token_address, cache_key)
+        )
+        # single_flight returns each caller its own list
+        if sort:
+            results.sort(key=_BY_LIQUIDITY, reverse=True)
+        return results
+    
+    async def _fetch_token_pairs_or_stale(
+        self,
+        chain_normalized: str,
+        token_address: str,
+        cache_key: str
+    ) -> List[TokenPrice]:
+        """_fetch_token_pairs, falling back to the stale cache on API failure"""
+        try:
+            return await self._fetch_token_pairs(chain_normalized, token_address, cache_key)
+        except NoLiquidityError:
+            raise
+        except DexScreenerError:
+            # Outage or open circuit: fall back to the last known price
+            stale = self.stale_cache.get(cache_key)
+            if stale is None:
+                raise
+            self.metrics['stale_served'] += 1
+            return [stale]
+    
+    async def _fetch_token_pairs(
+        self,
+        chain_normalized: str,
+        token_address: str,
+        cache_key: str
+    ) -> List[TokenPrice]:
+        """Uncached request behind get_token_pairs"""
         # Fetch from API
         endpoint = f"tokens/{token_address}"
         
@@ -326,39 +595,22 @@ class DexScreenerClient:
                 )
             
             results = []
+            address = token_address.lower()
+            now = time.time()
             
             for pair in data['pairs']:
                 # CRITICAL: Only include pairs from the requested chain
-                pair_chain = pair.get('chainId', '').lower()
-                
-                if pair_chain != chain_normalized:
+                # (IDs arrive lowercase; .lower() only runs on a mismatch)
+                chain_id = pair.get('chainId', '')
+                if chain_id != chain_normalized and chain_id.lower() != chain_normalized:
                     continue
                 
                 # Parse token data with full context
-                token_price = TokenPrice(
-                    chain_id=chain_normalized,
-                    contract_address=token_address.lower(),
-                    symbol=pair['baseToken']['symbol'],
-                    name=pair['baseToken']['name'],
-                    price_usd=float(pair.get('priceUsd', 0)),
-                    price_native=float(pair.get('priceNative', 0)),
-                    liquidity_usd=float(pair.get('liquidity', {}).get('usd', 0)),
-                    volume_24h=float(pair.get('volume', {}).get('h24', 0)),
-                    price_change_24h=float(pair.get('priceChange', {}).get('h24', 0)),
-                    dex_id=pair.get('dexId', 'unknown'),
-                    pair_address=pair.get('pairAddress', ''),
-                    unique_key=cache_key,
-                    timestamp=int(time.time())
-                )
-                
-                results.append(token_price)
+                results.append(self._parse_pair(pair, chain_normalized, address, now))
             
-            # Sort by liquidity (highest first)
-            results.sort(key=lambda x: x.liquidity_usd, reverse=True)
-            
-            # Cache the most liquid pair
+            # Cache the most liquid pair (callers sort only if they ask to)
             if results:
-                self.cache[cache_key] = (results[0], time.time())
+                self.cache[cache_key] = self.stale_cache[cache_key] = max(results, key=_BY_LIQUIDITY)
             
             return results
             
@@ -369,16 +621,137 @@ class DexScreenerClient:
             self.metrics['chain_errors'][chain_normalized] += 1
             raise
     
+    @staticmethod
+    def _parse_pair(pair: dict, chain_id: str, address: str, timestamp: float) -> TokenPrice:
+        """Build a TokenPrice for the pair's base token"""
+        base_token = pair['baseToken']
+        return TokenPrice(
+            chain_id=chain_id,
+            contract_address=address,
+            symbol=base_token['symbol'],
+            name=base_token['name'],
+            price_usd=float(pair.get('priceUsd', 0)),
+            price_native=float(pair.get('priceNative', 0)),
+            liquidity_usd=float((pair.get('liquidity') or _EMPTY).get('usd', 0)),
+            volume_24h=float((pair.get('volume') or _EMPTY).get('h24', 0)),
+            price_change_24h=float((pair.get('priceChange') or _EMPTY).get('h24', 0)),
+            dex_id=pair.get('dexId', 'unknown'),
+            pair_address=pair.get('pairAddress', ''),
+            timestamp=timestamp
+        )
+    
+    async def get_token_pairs_batch(
+        self,
+        chain: str,
+        token_addresses: List[str]
+    ) -> Dict[str, List[TokenPrice]]:
+        """
+        Get the pairs for several tokens on one chain
+        
+        Uses the multi-token endpoint, MAX_TOKENS_PER_REQUEST addresses per
+        request, with the chunks fetched concurrently. As in get_token_pairs,
+        a cached token yields just its cached (most liquid) pair.
+        
+        Args:
+            chain: Chain identifier (will be normalized)
+            token_addresses: Contract addresses
+            
+        Returns:
+            Mapping of lowercase address to its TokenPrice objects, most
+            liquid first (empty if no pairs exist)
+        """
+        chain_normalized = self.normalize_chain_id(chain)
+        
+        results: Dict[str, List[TokenPrice]] = {}
+        missing = []
+        for address in dict.fromkeys(address.lower() for address in token_addresses):
+            cached = self.cache.get(self._make_key_fast(chain_normalized, address))
+            if cached is not None:
+                self.metrics['cache_hits'] += 1
+                results[address] = [cached]
+            else:
+                self.metrics['cache_misses'] += 1
+                results[address] = []
+                missing.append(address)
+        
+        chunks = [
+            missing[i:i + self.MAX_TOKENS_PER_REQUEST]
+            for i in range(0, len(missing), self.MAX_TOKENS_PER_REQUEST)
+        ]
+        try:
+            responses = await asyncio.gather(*(
+                self._fetch(f"{chain_normalized}/{','.join(chunk)}", base_url=self.TOKENS_URL)
+                for chunk in chunks
+            ))
+        except DexScreenerError:
+            if chain_normalized not in self.metrics['chain_errors']:
+                self.metrics['chain_errors'][chain_normalized] = 0
+            self.metrics['chain_errors'][chain_normalized] += 1
+            
+            # Outage or open circuit: serve last known prices if all are known
+            stale = [self.stale_cache.get(self._make_key_fast(chain_normalized, address)) for address in missing]
+            if None in stale:
+                raise
+            self.metrics['stale_served'] += len(stale)
+            for address, price in zip(missing, stale):
+                results[address] = [price]
+            return results
+        
+        # One pass over all returned pairs, grouped by base token
+        requested = set(missing)
+        now = time.time()
+        for pairs in responses:
+            for pair in pairs or []:
+                chain_id = pair.get('chainId', '')
+                if chain_id != chain_normalized and chain_id.lower() != chain_normalized:
+                    continue  # Other chain (see _fetch_token_pairs)
+                address = pair['baseToken']['address'].lower()
+                if address not in requested:
+                    continue  # Pair where a requested token is only the quote token
+                results[address].append(self._parse_pair(pair, chain_normalized, address, now))
+        
+        for address in missing:
+            pairs = results[address]
+            if pairs:
+                pairs.sort(key=_BY_LIQUIDITY, reverse=True)
+                self.cache[pairs[0].unique_key] = self.stale_cache[pairs[0].unique_key] = pairs[0]
+        
+        return results
+    
+    async def get_token_prices_bulk(
+        self,
+        chain: str,
+        token_addresses: List[str]
+    ) -> Dict[str, Optional[TokenPrice]]:
+        """
+        Get the best (most liquid) price for several tokens on one chain
+        (batched like get_token_pairs_batch)
+        
+        Args:
+            chain: Chain identifier (will be normalized)
+            token_addresses: Contract addresses
+            
+        Returns:
+            Mapping of lowercase address to TokenPrice for its most liquid
+            pair, or None if no pairs exist
+        """
+        pairs_by_address = await self.get_token_pairs_batch(chain, token_addresses)
+        return {address: pairs[0] if pairs else None for address, pairs in pairs_by_address.items()}
+    
     async def search_tokens(self, query: str) -> List[dict]:
         """
         Search for tokens by symbol or name
         
         IMPORTANT: This returns tokens from ALL chains.
         You must filter by chain_id in the results.
+        
+        Raises:
+            DexScreenerError: Also if the response is larger than
+                MAX_SEARCH_RESPONSE_BYTES (narrow the query)
         """
         endpoint = f"search?q={query}"
         
-        data = await self._fetch(endpoint, is_profile=True)
+        data = await self._fetch(endpoint, is_profile=True, max_bytes=MAX_SEARCH_RESPONSE_BYTES)
         
         if not data.get('pairs'):
             return []
@@ -387,25 +760,25 @@ class DexScreenerClient:
         tokens_by_key = {}
         
         for pair in data['pairs']:
+            base_token = pair['baseToken']
             chain_id = pair.get('chainId', '').lower()
-            base_address = pair['baseToken']['address'].lower()
-            key = self.make_unique_key(chain_id, base_address)
+            base_address = base_token['address'].lower()
+            key = self._make_key_fast(chain_id, base_address)
             
-            if key not in tokens_by_key:
-                tokens_by_key[key] = {
+            token = tokens_by_key.get(key)
+            if token is None:
+                token = tokens_by_key[key] = {
                     'chain_id': chain_id,
                     'address': base_address,
-                    'symbol': pair['baseToken']['symbol'],
-                    'name': pair['baseToken']['name'],
+                    'symbol': base_token['symbol'],
+                    'name': base_token['name'],
                     'pairs_count': 0,
                     'total_liquidity': 0,
                     'unique_key': key
                 }
             
-            tokens_by_key[key]['pairs_count'] += 1
-            tokens_by_key[key]['total_liquidity'] += float(
-                pair.get('liquidity', {}).get('usd', 0)
-            )
+            token['pairs_count'] += 1
+            token['total_liquidity'] += float((pair.get('liquidity') or _EMPTY).get('usd', 0))
         
         return list(tokens_by_key.values())
     
@@ -422,7 +795,7 @@ class DexScreenerClient:
         """
         try:
             pairs = await self.get_token_pairs(chain, token_address)
-            return pairs[0] if pairs else None
+            return max(pairs, key=_BY_LIQUIDITY) if pairs else None
         except NoLiquidityError:
             return None
     
@@ -432,23 +805,50 @@ class DexScreenerClient:
         Useful for finding DEX-to-DEX arbitrage
         """
         all_pairs = await self.get_token_pairs(chain, token_address)
+        return self._best_per_dex(all_pairs)
+    
+    async def compare_prices_across_dexes_batch(
+        self,
+        chain: str,
+        token_addresses: List[str]
+    ) -> Dict[str, List[TokenPrice]]:
+        """
+        compare_prices_across_dexes for many tokens, with batched requests
+        (see get_token_pairs_batch)
         
-        # Group by DEX and keep only best price per DEX
+        Returns:
+            Mapping of lowercase address to its best pair per DEX
+        """
+        pairs_by_address = await self.get_token_pairs_batch(chain, token_addresses)
+        return {address: self._best_per_dex(pairs) for address, pairs in pairs_by_address.items()}
+    
+    @staticmethod
+    def _best_per_dex(pairs: List[TokenPrice]) -> List[TokenPrice]:
+        """Keep only the most liquid pair per DEX"""
         dex_prices = {}
         
-        for pair in all_pairs:
+        for pair in pairs:
             if pair.dex_id not in dex_prices or pair.liquidity_usd > dex_prices[pair.dex_id].liquidity_usd:
                 dex_prices[pair.dex_id] = pair
         
         return list(dex_prices.values())
     
+    def _cache_ttu(self, _key: str, price: TokenPrice, now: float) -> float:
+        """Expiry time of a cache entry, from cache_policy"""
+        for min_liquidity, ttl in self.cache_policy:
+            if price.liquidity_usd >= min_liquidity:
+                return now + ttl
+        return now  # Below every threshold: not cached
+    
     def get_metrics(self) -> dict:
         """Get client metrics for monitoring"""
+        lookups = self.metrics['cache_hits'] + self.metrics['cache_misses'] + self.metrics['inflight_joins']
         return {
             **self.metrics,
+            'cache_hit_rate': self.metrics['cache_hits'] / lookups if lookups else 0.0,
             'cache_size': len(self.cache),
             'circuit_breaker_state': self.circuit_breaker.state,
-            'circuit_breaker_failures': self.circuit_breaker.failures
+            'circuit_breaker_error_rate': self.circuit_breaker.error_rate
         }
 
 
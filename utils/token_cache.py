@@ -0,0 +1,145 @@
+import asyncio
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+# Token metadata (symbol, name, decimals) changes rarely; liquidity quickly
+METADATA_TTL_SECONDS = 3600
+PRICE_TTL_SECONDS = 300
+
+# Opt-in: without TOKEN_CACHE_PATH the registry keeps no disk cache
+DEFAULT_CACHE_PATH: Optional[str] = os.getenv('TOKEN_CACHE_PATH')
+
+COLUMNS = (
+    'unique_key', 'chain_id', 'address', 'symbol', 'name', 'decimals', 'liquidity_usd',
+    'is_verified', 'is_scam', 'scam_reason', 'added_timestamp',
+    'metadata_expires_at', 'price_expires_at'
+)
+
+
+class TokenDiskCache:
+    """
+    On-disk cache of verified tokens, so restarts don't re-fetch and
+    re-verify them
+
+    Keyed by "chain:address". A token is served from here while its price
+    is fresh; once only its metadata (symbol, name, decimals, verification)
+    is, the caller refetches just the price. Scam verdicts never expire.
+
+    The methods block on sqlite; from the event loop, call them through run().
+    """
+
+    def __init__(self, path: str):
+        # One worker thread serializes all use of the connection (see run)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='token-cache')
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS token_cache (
+                unique_key TEXT PRIMARY KEY,
+                chain_id TEXT NOT NULL,
+                address TEXT NOT NULL,
+                symbol TEXT,
+                name TEXT,
+                decimals INTEGER,
+                liquidity_usd REAL,
+                is_verified INTEGER,
+                is_scam INTEGER,
+                scam_reason TEXT,
+                added_timestamp REAL,
+                metadata_expires_at REAL,
+                price_expires_at REAL
+            )
+            """
+        )
+        self.conn.commit()
+
+    async def run(self, method: Callable, *args):
+        """Await one of this cache's methods on its worker thread, off the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, method, *args)
+
+    def get_many(self, keys: List[str]) -> Dict[str, sqlite3.Row]:
+        """
+        Get the usable cached tokens among keys
+
+        Returns:
+            Mapping of unique_key to row, for scam tokens and tokens whose
+            metadata has not expired (see has_fresh_price)
+        """
+        if not keys:
+            return {}
+        placeholders = ','.join('?' * len(keys))
+        rows = self.conn.execute(
+            f"SELECT * FROM token_cache WHERE unique_key IN ({placeholders}) "
+            f"AND (is_scam OR metadata_expires_at > ?)",
+            (*keys, time.time())
+        )
+        return {row['unique_key']: row for row in rows}
+
+    @staticmethod
+    def has_fresh_price(row: sqlite3.Row) -> bool:
+        """Whether a get_many row can be used as-is, without refreshing its liquidity"""
+        return bool(row['is_scam']) or row['price_expires_at'] > time.time()
+
+    def put_many(self, tokens: Iterable) -> None:
+        """
+        Store freshly fetched tokens (VerifiedToken objects) in one transaction
+        """
+        now = time.time()
+        rows = [
+            (
+                token.unique_key, token.chain_id, token.address, token.symbol, token.name,
+                token.decimals, token.liquidity_usd, token.is_verified, token.is_scam,
+                token.scam_reason, token.added_timestamp,
+                # Scam verdicts are kept permanently
+                None if token.is_scam else now + METADATA_TTL_SECONDS,
+                None if token.is_scam else now + PRICE_TTL_SECONDS
+            )
+            for token in tokens
+        ]
+        if not rows:
+            return
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO token_cache ({','.join(COLUMNS)}) "
+                f"VALUES ({','.join('?' * len(COLUMNS))})",
+                rows
+            )
+
+    def update_prices(self, tokens: Iterable) -> None:
+        """
+        Store refreshed liquidity for cached tokens (VerifiedToken objects),
+        keeping their metadata and its expiry
+        """
+        price_expires_at = time.time() + PRICE_TTL_SECONDS
+        rows = [(token.liquidity_usd, price_expires_at, token.unique_key) for token in tokens]
+        if not rows:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE token_cache SET liquidity_usd = ?, price_expires_at = ? WHERE unique_key = ?",
+                rows
+            )
+
+    def purge_expired(self) -> int:
+        """
+        Delete non-scam tokens whose metadata has expired
+
+        Returns:
+            Number of rows deleted
+        """
+        with self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM token_cache WHERE NOT is_scam AND metadata_expires_at <= ?",
+                (time.time(),)
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the database file (after any calls still queued by run())"""
+        self.executor.shutdown(wait=True)
+        self.conn.close()